@@ -8,6 +8,12 @@ class Settings:
     # Network Configuration
     DISCOVERY_ADDRESS = "172.28.67.255"
     DISCOVERY_TIMEOUT = 10  # seconds
+    DISCOVERY_PROBE_INTERVAL = 3.0  # seconds between WS-Discovery probes
+    DISCOVERY_ROUND_INTERVAL = 0.5  # seconds between checks for new answers
+    DISCOVERY_QUIET_PERIOD = 1.0  # seconds without new devices ending a search
+    SEARCH_GUARD_MARGIN = 5.0  # seconds past the timeout before a search is abandoned
+    DISCOVERY_EXECUTOR_WORKERS = 16  # Threads for blocking discovery/SDC calls
+    SERVICE_CACHE_TTL = 5.0  # seconds a service scan is reused by connects
 
     # Device Configuration
     BASE_UUID = uuid.UUID('{cc013678-79f6-403c-998f-3cc0cc050230}')
@@ -15,6 +21,11 @@ class Settings:
     # UI Configuration
     CHART_MAX_POINTS = 100  # Maximum data points to display in charts
     UPDATE_INTERVAL = 1.0   # seconds
+    METRIC_FLUSH_INTERVAL = 0.05  # seconds metric reports are coalesced for
+    CHART_FLUSH_INTERVAL = 0.25  # seconds between chart pushes to the browser
+
+    # Runtime Configuration
+    USE_UVLOOP = True  # Use uvloop's event loop when it is installed
 
     # Logging
     LOG_LEVEL = "INFO"
@@ -1,4 +1,5 @@
 """Controller for managing individual device connections."""
+import asyncio
 import logging
 from typing import Optional, Callable, Dict
 from models.device import Device, DeviceStatus
@@ -55,11 +56,12 @@ class DeviceController:
     async def _find_wsd_service(self):
         """Find the WSD service object for this device."""
         # Search for services again to get fresh WSD service objects
-        services = self.discovery_service.search_services(timeout=5)
-        for service in services:
-            if service.epr == self.device.epr:
-                return service
-        return None
+        loop = asyncio.get_running_loop()
+        services_by_epr = await loop.run_in_executor(
+            None,
+            lambda: self.discovery_service.find_services(timeout=5)
+        )
+        return services_by_epr.get(self.device.epr)
 
     def disconnect(self):
         """Disconnect from the device."""
@@ -94,9 +96,13 @@ class DeviceController:
         return self.metric_service.get_all_latest_metrics()
 
     def get_metric_history(self, handle: str, limit: int = None):
-        """Get historical data for a specific metric."""
+        """Get historical (timestamps, values) arrays for a specific metric."""
         return self.metric_service.get_metric_history(handle, limit)
 
+    def track_metric_history(self, handle: str):
+        """Keep history for a metric even when no callback is registered."""
+        self.metric_service.track_handle(handle)
+
     def register_metric_callback(self, callback: Callable):
         """
         Register callback for metric updates.
@@ -1,8 +1,11 @@
 """Controller for device discovery operations."""
+import asyncio
 import logging
-from typing import List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Callable
 from models.device import Device
 from services.discovery_service import DiscoveryService
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +15,15 @@ class DiscoveryController:
 
     def __init__(self):
         self.discovery_service = DiscoveryService()
+        # Dedicated pool for blocking network IO, installed as the loop's default executor
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=settings.DISCOVERY_EXECUTOR_WORKERS,
+            thread_name_prefix="sdc-io"
+        )
         self.discovered_devices: List[Device] = []
+        self._devices_by_epr: Dict[str, Device] = {}
         self._on_devices_found_callback: Callable = None
+        self._on_device_found_callback: Callable = None
         self._on_error_callback: Callable = None
         self._is_searching = False
 
@@ -32,6 +42,7 @@ class DiscoveryController:
         """Shutdown the controller and stop discovery service."""
         try:
             self.discovery_service.stop()
+            self.io_executor.shutdown(wait=False)
             logger.info("Discovery controller shutdown")
         except Exception as e:
             logger.error(f"Error during discovery controller shutdown: {e}")
@@ -50,20 +61,20 @@ class DiscoveryController:
         try:
             self._is_searching = True
             logger.info("Starting device search...")
-            print(f"DEBUG: Starting search with timeout={timeout}")
-
-            # Perform discovery (blocking call, should run in executor for true async)
-            import asyncio
-            loop = asyncio.get_event_loop()
-            devices = await loop.run_in_executor(
-                None,
-                self.discovery_service.search_devices,
-                timeout
-            )
+
+            # Discovery offloads the blocking probe itself; the guard keeps a
+            # hung probe from leaving the UI in the searching state
+            timeout = timeout or settings.DISCOVERY_TIMEOUT
+            devices = await asyncio.wait_for(
+                self.discovery_service.search_devices(
+                    timeout, on_device=self._on_device_found_callback),
+                timeout + settings.SEARCH_GUARD_MARGIN)
+            # Sort once here so views can render the list as-is
+            devices.sort(key=Device.get_display_name)
             self.discovered_devices = devices
+            self._devices_by_epr = {d.epr: d for d in devices}
 
             logger.info(f"Search complete. Found {len(devices)} device(s)")
-            print(f"DEBUG: Found {len(devices)} devices")
 
             # Notify callback
             if self._on_devices_found_callback:
@@ -71,14 +82,16 @@ class DiscoveryController:
             else:
                 logger.warning("No callback set for devices found!")
 
+        except asyncio.TimeoutError:
+            logger.error("Device search did not finish in time")
+            if self._on_error_callback:
+                self._on_error_callback("Device search timed out")
         except Exception as e:
             logger.error(f"Error during device search: {e}", exc_info=True)
-            print(f"DEBUG: Error during search: {e}")
             if self._on_error_callback:
                 self._on_error_callback(str(e))
         finally:
             self._is_searching = False
-            print("DEBUG: Search completed")
 
     def get_device_by_epr(self, epr: str) -> Device:
         """
@@ -90,10 +103,7 @@ class DiscoveryController:
         Returns:
             Device object or None
         """
-        for device in self.discovered_devices:
-            if device.epr == epr:
-                return device
-        return None
+        return self._devices_by_epr.get(epr)
 
     def is_searching(self) -> bool:
         """Check if a search is currently in progress."""
@@ -108,6 +118,15 @@ class DiscoveryController:
         """
         self._on_devices_found_callback = callback
 
+    def set_on_device_found_callback(self, callback: Callable):
+        """
+        Set callback to be called for each device while a search runs.
+
+        Args:
+            callback: Function(Device) to call as soon as a device answers
+        """
+        self._on_device_found_callback = callback
+
     def set_on_error_callback(self, callback: Callable):
         """
         Set callback to be called on errors.
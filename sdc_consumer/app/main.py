@@ -6,12 +6,7 @@ It follows MVC architecture for scalability and maintainability.
 """
 import logging
 import asyncio
-from nicegui import ui, app
-from controllers.discovery_controller import DiscoveryController
-from controllers.device_controller import DeviceController
-from views.main_view import MainView
-from views.device_view import DeviceView
-from models.device import Device
+from collections import deque
 from config.settings import settings
 
 # Configure logging
@@ -22,6 +17,32 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def install_event_loop_policy():
+    """Use uvloop for the asyncio event loop when enabled and available."""
+    if not settings.USE_UVLOOP:
+        return
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not available, using default asyncio event loop")
+        return
+
+    uvloop.install()
+    logger.info("Using uvloop event loop")
+
+
+# The policy must be in place before NiceGUI is imported and sets up its loop
+install_event_loop_policy()
+
+from nicegui import ui, app, background_tasks  # noqa: E402
+from controllers.discovery_controller import DiscoveryController  # noqa: E402
+from controllers.device_controller import DeviceController  # noqa: E402
+from views.main_view import MainView  # noqa: E402
+from views.device_view import DeviceView  # noqa: E402
+from models.device import Device, MetricData  # noqa: E402
+
+
 class SDCMonitorApp:
     """Main application class coordinating all components."""
 
@@ -30,6 +51,9 @@ class SDCMonitorApp:
         self.current_device_controller = None
         self.main_view = None
         self.device_view = None
+        # Metrics waiting for the next UI update, oldest first per handle and
+        # capped at one chart's worth of points: {handle: deque[MetricData]}
+        self._ui_queue: dict[str, deque] = {}
 
     def initialize(self):
         """Initialize the application."""
@@ -41,6 +65,9 @@ class SDCMonitorApp:
             self.discovery_controller.set_on_devices_found_callback(
                 self._on_devices_found
             )
+            self.discovery_controller.set_on_device_found_callback(
+                self._on_device_found
+            )
             self.discovery_controller.set_on_error_callback(
                 self._on_discovery_error
             )
@@ -71,6 +98,17 @@ class SDCMonitorApp:
         # Set up routes
         self.setup_routes()
 
+        # Route blocking discovery/SDC calls through the IO executor
+        app.on_startup(self._install_io_executor)
+
+        # Search in the background so the UI is interactive immediately
+        app.on_startup(lambda: background_tasks.create(
+            self.discovery_controller.search_for_devices()))
+
+        # Push queued metric updates to the device view in batches
+        app.on_startup(lambda: background_tasks.create(
+            self._ui_update_loop()))
+
         # Handle app shutdown
         app.on_shutdown(self.shutdown)
 
@@ -82,6 +120,11 @@ class SDCMonitorApp:
             reload=False
         )
 
+    def _install_io_executor(self):
+        """Make the discovery IO executor the default for run_in_executor."""
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(self.discovery_controller.io_executor)
+
     def setup_routes(self):
         """Set up application routes."""
 
@@ -95,6 +138,11 @@ class SDCMonitorApp:
             # Connect search callback to controller
             self.main_view.set_search_callback(self._on_search_clicked)
 
+            # Show results of the startup search if it already finished
+            if self.discovery_controller.discovered_devices:
+                self.main_view.display_devices(
+                    self.discovery_controller.discovered_devices)
+
         @ui.page('/device')
         def device_page():
             """Device monitoring page."""
@@ -108,24 +156,68 @@ class SDCMonitorApp:
                 device, on_back=self._on_back_to_main)
             self.device_view.render()
 
-            # Register for metric updates
+            # Prefill charts with the history collected so far and keep
+            # recording it for the next time this page is opened
+            for handle, chart in self.device_view.charts.items():
+                self.current_device_controller.track_metric_history(handle)
+                chart.set_history(
+                    *self.current_device_controller.get_metric_history(handle))
+
+            # Register for metric updates; the queue outlives page reloads,
+            # so the same callback is only registered once
+            self._ui_queue.clear()
             self.current_device_controller.register_metric_callback(
-                self.device_view.update_metrics
+                self._queue_metric_updates
             )
 
+    def _queue_metric_updates(self, metrics: list[MetricData]):
+        """Queue metric updates for the device view, keeping every point per handle."""
+        queue = self._ui_queue
+        for metric in metrics:
+            points = queue.get(metric.handle)
+            if points is None:
+                points = queue[metric.handle] = deque(
+                    maxlen=settings.CHART_MAX_POINTS)
+            points.append(metric)
+
+    async def _ui_update_loop(self):
+        """Drain queued metric updates into the device view once per interval."""
+        while True:
+            await asyncio.sleep(settings.METRIC_FLUSH_INTERVAL)
+            if not self._ui_queue or not self.device_view:
+                continue
+
+            batch = [metric for points in self._ui_queue.values()
+                     for metric in points]
+            self._ui_queue.clear()
+            try:
+                self.device_view.update_metrics(batch)
+            except Exception as e:
+                logger.error(f"Error updating device view: {e}")
+
     async def _on_search_clicked(self):
         """Handle search button click."""
         self.main_view.show_searching()
-        await self.discovery_controller.search_for_devices()
-        self.main_view.hide_searching()
+        try:
+            await self.discovery_controller.search_for_devices()
+        finally:
+            self.main_view.hide_searching()
+
+    def _on_device_found(self, device):
+        """Callback for each device answering a running search."""
+        if self.main_view:
+            self.main_view.add_device(device)
 
     def _on_devices_found(self, devices):
         """Callback when devices are discovered."""
-        self.main_view.display_devices(devices)
+        # The startup search may finish before any page has been opened
+        if self.main_view:
+            self.main_view.display_devices(devices)
 
     def _on_discovery_error(self, error_message):
         """Callback when discovery encounters an error."""
-        self.main_view.show_error(error_message)
+        if self.main_view:
+            self.main_view.show_error(error_message)
 
     async def _on_device_selected(self, device: Device):
         """Handle device selection from main view."""
@@ -139,7 +231,7 @@ class SDCMonitorApp:
             # Create device controller
             self.current_device_controller = DeviceController(
                 device,
-                self.discovery_controller.discovery_service.discovery
+                self.discovery_controller.discovery_service
             )
 
             # Set up callbacks
@@ -190,10 +282,6 @@ def main():
         sdc_app = SDCMonitorApp()
         sdc_app.initialize()
 
-        devices = sdc_app.discovery_controller.discovery_service.search_devices(
-            5)
-        print(f"Test found {len(devices)} devices")
-
         # Run the application
         sdc_app.run()
 
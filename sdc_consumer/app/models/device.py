@@ -1,6 +1,8 @@
 """Device data models."""
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Optional, Dict, TYPE_CHECKING
+from typing import Any, Optional, Dict, TYPE_CHECKING
 from datetime import datetime
 from enum import Enum
 
@@ -18,8 +20,14 @@ class DeviceStatus(Enum):
     DISCONNECTED = "disconnected"
     ERROR = "error"
 
+    def __init__(self, value):
+        # Plain attributes skip the Enum.value descriptor on every render;
+        # interned so status string comparisons are identity checks
+        self.display = sys.intern(value)
+        self.label = sys.intern(value.title())
 
-@dataclass
+
+@dataclass(slots=True)
 class LocationInfo:
     """Device location information."""
     facility: Optional[str] = None
@@ -42,7 +50,7 @@ class LocationInfo:
         return ", ".join(parts) if parts else "Location not available"
 
 
-@dataclass
+@dataclass(slots=True)
 class Device:
     """Represents an SDC medical device with full DPWS information."""
 
@@ -77,15 +85,42 @@ class Device:
     xaddrs: Optional[list] = field(default=None, repr=False)
     scopes: Optional[list] = field(default=None, repr=False)
 
+    # Cached results of get_display_name / get_full_info, reset by clear_cached_info
+    _display_name: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+    _info_static: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Cached short_id; the EPR does not change after discovery
+    _short_id: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    # MDIB lookups by handle, built by DeviceHelper: {handle: state/descriptor}
+    _state_index: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _descriptor_index: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _index_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False)
+
     def __str__(self):
         return f"{self.get_display_name()} ({self.epr})"
 
     def is_connected(self) -> bool:
         """Check if device has active connection."""
-        return self.status == DeviceStatus.CONNECTED and self.client is not None
+        return self.status is DeviceStatus.CONNECTED and self.client is not None
 
     def get_display_name(self):
         """Returns a user-friendly display name."""
+        if self._display_name is None:
+            self._display_name = self._compute_display_name()
+        return self._display_name
+
+    def clear_cached_info(self):
+        """Drop cached values derived from DPWS fields after they change."""
+        self._display_name = None
+        self._info_static = None
+
+    def _compute_display_name(self):
         # Priority: Friendly Name > Model Name > Manufacturer + Model
         if self.friendly_name:
             return self.friendly_name
@@ -97,20 +132,41 @@ class Device:
             return self.manufacturer
         return self.name or "Medical Device"
 
+    @property
+    def short_id(self) -> str:
+        """Shortened version of the EPR for display, computed once."""
+        if self._short_id is None:
+            epr = self.epr
+            if epr.startswith('urn:uuid:'):
+                self._short_id = epr[9:17] + '...'
+            else:
+                self._short_id = epr[:16] + '...' if len(epr) > 16 else epr
+        return self._short_id
+
     def get_short_id(self):
         """Returns a shortened version of the EPR for display."""
-        if self.epr.startswith('urn:uuid:'):
-            return self.epr.replace('urn:uuid:', '')[:8] + '...'
-        return self.epr[:16] + '...' if len(self.epr) > 16 else self.epr
+        return self.short_id
 
     def get_full_info(self) -> str:
         """Returns formatted full device information."""
         lines = [
             f"Device: {self.get_display_name()}",
             f"EPR: {self.epr}",
-            f"Status: {self.status.value}",
+            f"Status: {self.status.display}",
         ]
 
+        if self._info_static is None:
+            self._info_static = self._build_static_info()
+        if self._info_static:
+            lines.append(self._info_static)
+        if self.is_connected():
+            lines.append("Connection: Active ✓")
+
+        return "\n".join(lines)
+
+    def _build_static_info(self) -> str:
+        """Format the DPWS and network lines that only change on repopulate."""
+        lines = []
         if self.manufacturer:
             lines.append(f"Manufacturer: {self.manufacturer}")
         if self.model_number:
@@ -123,20 +179,22 @@ class Device:
             lines.append(f"IP Address: {self.ip_address}")
         if self.location:
             lines.append(f"Location: {self.location}")
-        if self.is_connected():
-            lines.append("Connection: Active ✓")
-
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetricData:
     """Represents a single metric reading."""
     handle: str
     name: str
     value: float
     unit: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.time_ns)  # ns since epoch
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Reading time as a local datetime, built only when displayed."""
+        return datetime.fromtimestamp(self.timestamp / 1e9)
 
     def __str__(self):
         return f"{self.name}: {self.value} {self.unit}"
@@ -1,18 +1,24 @@
 """Metric data models."""
 from dataclasses import dataclass, field
 from typing import Optional, Dict
+import time
 from datetime import datetime
 from enum import Enum
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetricData:
     """Represents a single metric reading."""
     handle: str
     name: str
     value: float
     unit: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.time_ns)  # ns since epoch
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Reading time as a local datetime, built only when displayed."""
+        return datetime.fromtimestamp(self.timestamp / 1e9)
 
     def __str__(self):
         return f"{self.name}: {self.value} {self.unit}"
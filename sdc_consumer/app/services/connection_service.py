@@ -1,22 +1,53 @@
 """Service for managing SDC device connections."""
+import asyncio
 import logging
-from typing import Optional, Callable
+import threading
+from typing import Any, Dict, Optional, Callable
 from sdc11073.consumer import SdcConsumer
 from sdc11073.mdib import ConsumerMdib
 from sdc11073 import observableproperties
-from models.device import Device, DeviceStatus
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types import pm_types
+from models.device import Device, DeviceStatus, LocationInfo
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Status polled by UI refreshes, bound once to skip the enum attribute lookup
+_CONNECTED = DeviceStatus.CONNECTED
+
 
 class ConnectionService:
     """Manages connection to a single SDC device."""
 
+    # DPWS fields copied onto the Device: (device_attr, dpws_attr, needs_text)
+    _MODEL_MAP = (
+        ('manufacturer', 'Manufacturer', True),
+        ('manufacturer_url', 'ManufacturerUrl', False),
+        ('model_name', 'ModelName', True),
+        ('model_number', 'ModelNumber', False),
+        ('model_url', 'ModelUrl', False),
+        ('presentation_url', 'PresentationUrl', False),
+    )
+    _DEVICE_MAP = (
+        ('friendly_name', 'FriendlyName', True),
+        ('firmware_version', 'FirmwareVersion', False),
+        ('serial_number', 'SerialNumber', False),
+    )
+
     def __init__(self, device: Device):
         self.device = device
         self.consumer: Optional[SdcConsumer] = None
         self.mdib: Optional[ConsumerMdib] = None
         self._metric_callback: Optional[Callable] = None
+        # MDIB version the location was last read at
+        self._location_mdib_version: Optional[int] = None
+        # Metric states received since the last flush: {handle: metric_state}
+        self._pending_metrics: Dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+        self._dirty = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
 
     def connect(self, wsd_service):
         """
@@ -58,34 +89,19 @@ class ConnectionService:
     def _populate_device_info(self):
         """Extract and populate device information from DPWS and MDIB."""
         try:
-            # Get DPWS Model Information
-            if hasattr(self.consumer, 'host_description') and self.consumer.host_description:
-                host_desc = self.consumer.host_description
-
-                # Model Information
-                if hasattr(host_desc, 'this_model') and host_desc.this_model:
-                    model = host_desc.this_model
-                    self.device.manufacturer = self._get_text(
-                        getattr(model, 'Manufacturer', None))
-                    self.device.manufacturer_url = getattr(
-                        model, 'ManufacturerUrl', None)
-                    self.device.model_name = self._get_text(
-                        getattr(model, 'ModelName', None))
-                    self.device.model_number = getattr(
-                        model, 'ModelNumber', None)
-                    self.device.model_url = getattr(model, 'ModelUrl', None)
-                    self.device.presentation_url = getattr(
-                        model, 'PresentationUrl', None)
-
-                # Device Information
-                if hasattr(host_desc, 'this_device') and host_desc.this_device:
-                    device_info = host_desc.this_device
-                    self.device.friendly_name = self._get_text(
-                        getattr(device_info, 'FriendlyName', None))
-                    self.device.firmware_version = getattr(
-                        device_info, 'FirmwareVersion', None)
-                    self.device.serial_number = getattr(
-                        device_info, 'SerialNumber', None)
+            # Get DPWS Model and Device Information
+            host_desc = getattr(self.consumer, 'host_description', None)
+            if host_desc:
+                for source_attr, field_map in (
+                        ('this_model', self._MODEL_MAP),
+                        ('this_device', self._DEVICE_MAP)):
+                    source = getattr(host_desc, source_attr, None)
+                    if not source:
+                        continue
+                    for dest, src, needs_text in field_map:
+                        value = getattr(source, src, None)
+                        setattr(self.device, dest,
+                                self._get_text(value) if needs_text else value)
 
             # Get Location from MDIB if not already set
             if self.device.location is None or not any([
@@ -95,6 +111,8 @@ class ConnectionService:
             ]):
                 self._populate_location_from_mdib()
 
+            self.device.clear_cached_info()
+
             logger.info(
                 f"Device info populated: {self.device.get_display_name()}")
 
@@ -104,28 +122,33 @@ class ConnectionService:
     def _populate_location_from_mdib(self):
         """Extract location information from MDIB context states."""
         try:
-            from sdc11073.xml_types import pm_qnames as pm
-            from sdc11073.xml_types import pm_types
-            from models.device import LocationInfo
+            # Context states only change with the MDIB version
+            mdib_version = self.mdib.mdib_version
+            if mdib_version == self._location_mdib_version:
+                return
+            self._location_mdib_version = mdib_version
 
             location_contexts = self.mdib.context_states.NODETYPE.get(
                 pm.LocationContextState, [])
-
-            for loc in location_contexts:
-                if loc.ContextAssociation == pm_types.ContextAssociation.ASSOCIATED:
-                    if loc.LocationDetail:
-                        detail = loc.LocationDetail
-                        self.device.location = LocationInfo(
-                            facility=getattr(detail, 'Facility', None),
-                            poc=getattr(detail, 'PoC', None),
-                            bed=getattr(detail, 'Bed', None),
-                            room=getattr(detail, 'Room', None),
-                            building=getattr(detail, 'Building', None),
-                            floor=getattr(detail, 'Floor', None)
-                        )
-                        logger.info(
-                            f"Location populated from MDIB: {self.device.location}")
-                        break
+            associated = pm_types.ContextAssociation.ASSOCIATED
+
+            loc = next((loc for loc in location_contexts
+                        if loc.ContextAssociation == associated
+                        and loc.LocationDetail), None)
+            if loc is None:
+                return
+
+            detail = loc.LocationDetail
+            self.device.location = LocationInfo(
+                facility=getattr(detail, 'Facility', None),
+                poc=getattr(detail, 'PoC', None),
+                bed=getattr(detail, 'Bed', None),
+                room=getattr(detail, 'Room', None),
+                building=getattr(detail, 'Building', None),
+                floor=getattr(detail, 'Floor', None)
+            )
+            logger.info(
+                f"Location populated from MDIB: {self.device.location}")
 
         except Exception as e:
             logger.debug(f"Could not extract location from MDIB: {e}")
@@ -134,13 +157,18 @@ class ConnectionService:
         """Extract text from LocalizedStringType or return value as-is."""
         if value is None:
             return None
-        if isinstance(value, list) and len(value) > 0:
-            first_item = value[0]
-            if hasattr(first_item, 'text'):
-                return first_item.text
-        elif hasattr(value, 'text'):
+        # Common case: list of LocalizedStringType items
+        if type(value) is list:
+            if not value:
+                return None
+            try:
+                return value[0].text
+            except AttributeError:
+                return str(value)
+        try:
             return value.text
-        return str(value) if value else None
+        except AttributeError:
+            return str(value) if value else None
 
     def disconnect(self):
         """Disconnect from the device."""
@@ -149,9 +177,13 @@ class ConnectionService:
                 # Unbind the callback
                 observableproperties.unbind(
                     self.mdib,
-                    metrics_by_handle=self._metric_callback
+                    metrics_by_handle=self._on_metrics_by_handle
                 )
 
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
             if self.consumer:
                 self.consumer.stop_all()
 
@@ -165,6 +197,9 @@ class ConnectionService:
         """
         Subscribe to metric updates from the device.
 
+        Reports are merged and delivered as one call on the event loop thread
+        by a single timer ticking every settings.METRIC_FLUSH_INTERVAL.
+
         Args:
             callback: Function to call when metrics are updated
                      Should accept (metrics_by_handle: dict) parameter
@@ -173,12 +208,41 @@ class ConnectionService:
             raise RuntimeError("Not connected to device")
 
         self._metric_callback = callback
+        self._loop = asyncio.get_running_loop()
+        if self._flush_timer is None:
+            self._flush_timer = self._loop.call_later(
+                settings.METRIC_FLUSH_INTERVAL, self._tick)
         observableproperties.bind(
             self.mdib,
-            metrics_by_handle=callback
+            metrics_by_handle=self._on_metrics_by_handle
         )
         logger.info(f"Subscribed to metrics for {self.device.epr}")
 
+    def _on_metrics_by_handle(self, metrics_by_handle: dict):
+        """Buffer a metric report from the MDIB thread until the next tick."""
+        with self._pending_lock:
+            self._pending_metrics.update(metrics_by_handle)
+            self._dirty = True
+
+    def _tick(self):
+        """Deliver buffered metric states, then rearm the flush timer."""
+        try:
+            if self._dirty:
+                self._flush_metrics()
+        finally:
+            self._flush_timer = self._loop.call_later(
+                settings.METRIC_FLUSH_INTERVAL, self._tick)
+
+    def _flush_metrics(self):
+        """Deliver all buffered metric states in a single callback."""
+        with self._pending_lock:
+            batch = self._pending_metrics
+            self._pending_metrics = {}
+            self._dirty = False
+
+        if batch and self._metric_callback:
+            self._metric_callback(batch)
+
     def get_metric_descriptor(self, handle: str):
         """
         Get descriptor information for a metric.
@@ -196,7 +260,7 @@ class ConnectionService:
 
     def is_connected(self) -> bool:
         """Check if currently connected to device."""
-        return self.device.status == DeviceStatus.CONNECTED
+        return self.device.status is _CONNECTED
 
     def __enter__(self):
         """Context manager entry."""
@@ -1,90 +1,300 @@
 """Service for discovering SDC devices on the network."""
+import asyncio
 import logging
-from typing import List
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import unquote
 from sdc11073.wsdiscovery import WSDiscovery
 from sdc11073.definitions_sdc import SdcV1Definitions
 from models.device import Device, DeviceStatus, LocationInfo
+from utils.adaptive_timeout import AdaptiveTimeout
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Discovery service lifecycle states
+_STOPPED = 0
+_RUNNING = 1
+
+# Parsed services kept across searches before the oldest are evicted
+_FIELDS_CACHE_SIZE = 512
+
+# Seconds search_services waits after sending a single probe
+_PROBE_SEND_TIMEOUT = 0.01
+
 
 class DiscoveryService:
     """Handles device discovery using WS-Discovery protocol."""
 
+    # Substring present in every SDC location scope
+    _LOC_SCOPE_MARKER = 'sdc.ctxt.loc'
+    # Location scope query keys mapped to LocationInfo fields
+    _LOC_FIELDS = {'fac': 'facility', 'poc': 'poc', 'bed': 'bed',
+                   'rm': 'room', 'bldng': 'building', 'flr': 'floor'}
+
     def __init__(self):
         self.discovery = None
-        self._is_running = False
+        self._state = _STOPPED
+        # Guards start/stop transitions so WSDiscovery is never started twice
+        self._state_lock = threading.Lock()
+        # Last service scan indexed by EPR: {epr: wsd_service}
+        self._services_by_epr: Dict[str, Any] = {}
+        self._services_scanned_at = float('-inf')
+        # Serializes scans so concurrent connects share a single one
+        self._services_lock = threading.Lock()
+        # Parsed Device fields per EPR, reused while xAddrs and scopes are
+        # unchanged: {epr: (signature, fields)}
+        self._fields_cache: Dict[str, Tuple[tuple, dict]] = {}
+        # First-response times of devices, used to cut searches short
+        self._response_times = AdaptiveTimeout()
+        # Guards the running search's state, which the probe-match callback
+        # updates from the WS-Discovery receive thread
+        self._search_lock = threading.Lock()
+        # Running search as (started_at, {epr: first_response_at},
+        # answered event), or None
+        self._search: Optional[Tuple[float, Dict[str, float], threading.Event]] = None
 
     def start(self):
         """Start the discovery service."""
-        if self._is_running:
-            logger.warning("Discovery service already running")
-            return
+        with self._state_lock:
+            if self._state == _RUNNING:
+                logger.warning("Discovery service already running")
+                return
 
-        try:
-            self.discovery = WSDiscovery(settings.DISCOVERY_ADDRESS)
-            self.discovery.start()
-            self._is_running = True
-            logger.info("Discovery service started")
-        except Exception as e:
-            logger.error(f"Failed to start discovery service: {e}")
-            raise
+            try:
+                self.discovery = WSDiscovery(settings.DISCOVERY_ADDRESS)
+                self.discovery.set_on_probe_matches_callback(
+                    self._on_probe_matches)
+                self.discovery.start()
+                self._state = _RUNNING
+                logger.info("Discovery service started")
+            except Exception as e:
+                logger.error("Failed to start discovery service: %s", e)
+                raise
 
     def stop(self):
         """Stop the discovery service."""
-        if self.discovery and self._is_running:
+        if self._state == _STOPPED:
+            return
+
+        with self._state_lock:
+            if self._state == _STOPPED:
+                return
             try:
                 self.discovery.stop()
-                self._is_running = False
+                self._state = _STOPPED
                 logger.info("Discovery service stopped")
             except Exception as e:
-                logger.error(f"Error stopping discovery service: {e}")
+                logger.error("Error stopping discovery service: %s", e)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the WS-Discovery instance is started."""
+        return self._state == _RUNNING
 
-    def search_devices(self, timeout: int = None) -> List[Device]:
+    async def search_devices(self, timeout: int = None,
+                             on_device: Callable = None) -> List[Device]:
         """
         Search for SDC medical devices on the network.
 
+        The blocking WS-Discovery probe runs in a worker thread of the loop's
+        default executor, so the event loop stays responsive for the whole
+        search timeout; the results are turned into Devices on the loop.
+
         Args:
             timeout: Search timeout in seconds
+            on_device: Optional callback(Device), called on the event loop for
+                       each device as soon as it answers a probe round
 
         Returns:
             List of discovered Device objects
         """
-        if not self._is_running:
+        if self._state != _RUNNING:
             raise RuntimeError("Discovery service not started")
 
         timeout = timeout or settings.DISCOVERY_TIMEOUT
         devices = []
 
+        on_new_services = None
+        if on_device is not None:
+            loop = asyncio.get_running_loop()
+
+            def on_new_services(new_services):
+                loop.call_soon_threadsafe(
+                    self._emit_devices, new_services, on_device)
+
         try:
-            logger.info(f"Searching for devices (timeout: {timeout}s)...")
-            services = self.discovery.search_services(
-                types=SdcV1Definitions.MedicalDeviceTypesFilter,
-                timeout=timeout
-            )
+            logger.info("Searching for devices (timeout: %ss)...", timeout)
+            services = await asyncio.to_thread(
+                self._scan_medical_devices, timeout, on_new_services)
 
-            logger.info(f"services find services {services}")
+            logger.debug("services find services %s", services)
 
+            # Presized and filled by index; trimmed if any service fails
+            devices = [None] * len(services)
+            count = 0
+            create_device = self._create_device_from_service
             for service in services:
                 try:
-                    device = self._create_device_from_service(service)
-                    devices.append(device)
-                    logger.info(
-                        f"Discovered device: {device.epr} - {device.get_display_name()}")
+                    device = create_device(service)
+                    devices[count] = device
+                    count += 1
+                    # Device.__str__ (name and EPR) only runs if the record is emitted
+                    logger.info("Discovered device: %s", device)
                 except Exception as e:
                     logger.error(
-                        f"Error processing discovered device: {e}", exc_info=True)
+                        "Error processing discovered device: %s", e, exc_info=True)
+            del devices[count:]
 
-            logger.info(f"Discovery complete. Found {len(devices)} device(s)")
+            logger.info("Discovery complete. Found %s device(s)", len(devices))
 
         except Exception as e:
-            logger.error(f"Error during device search: {e}")
+            logger.error("Error during device search: %s", e)
             raise
 
         return devices
 
+    def _emit_devices(self, services, on_device: Callable):
+        """Turn services found by a probe round into Devices for a callback."""
+        for service in services:
+            try:
+                on_device(self._create_device_from_service(service))
+            except Exception as e:
+                logger.error("Error reporting discovered device: %s", e)
+
+    def _scan_medical_devices(self, timeout: int,
+                              on_new_services: Callable = None):
+        """
+        Blocking WS-Discovery probe for SDC medical devices.
+
+        Probes every settings.DISCOVERY_PROBE_INTERVAL and checks for new
+        answers every settings.DISCOVERY_ROUND_INTERVAL (or as soon as one
+        arrives). Only devices answering this search's probes count: a search
+        returns early once at least one has answered and no new one has
+        appeared for settings.DISCOVERY_QUIET_PERIOD, so it only takes the
+        full timeout when nothing responds. Once enough response times are
+        known, a search also ends when their adaptive cutoff has passed with
+        no new response in the last half of it.
+
+        Services of devices answering for the first time are passed to
+        on_new_services, from the scanning thread, after each round.
+        """
+        types = SdcV1Definitions.MedicalDeviceTypesFilter
+        round_interval = settings.DISCOVERY_ROUND_INTERVAL
+        probe_interval = settings.DISCOVERY_PROBE_INTERVAL
+        quiet_period = settings.DISCOVERY_QUIET_PERIOD
+        now = started = next_probe = time.monotonic()
+        deadline = now + timeout
+        last_new_at = None
+        seen = set()
+
+        # EPRs answering this search with their first response time; filled
+        # by _on_probe_matches and only touched under _search_lock
+        responded: Dict[str, float] = {}
+        # Set by _on_probe_matches when a device answers for the first time
+        answered = threading.Event()
+        search = (started, responded, answered)
+        with self._search_lock:
+            adaptive = self._response_times.get()
+            self._search = search
+        try:
+            while now < deadline:
+                if now >= next_probe:
+                    self._send_probe(types)
+                    next_probe = now + probe_interval
+                answered.wait(min(round_interval, deadline - now,
+                                  max(0.0, next_probe - now)))
+                answered.clear()
+                now = time.monotonic()
+
+                with self._search_lock:
+                    new_eprs = responded.keys() - seen
+                    last_response = max(responded.values(), default=None)
+
+                # Probe matches are not filtered by type; only medical
+                # devices known to the discovery table are counted
+                if new_eprs:
+                    known = {service.epr: service for service in
+                             self.discovery.get_found_remote_services(types)}
+                    new_services = [known[epr] for epr in new_eprs
+                                    if epr in known]
+                    seen |= new_eprs
+                    if new_services:
+                        last_new_at = now
+                        if on_new_services is not None:
+                            on_new_services(new_services)
+                elif last_new_at is not None and now - last_new_at >= quiet_period:
+                    break
+                if (adaptive is not None and now - started >= adaptive
+                        and last_response is not None
+                        and now - last_response >= adaptive / 2):
+                    break
+        finally:
+            # A scan abandoned by the search guard may finish after a newer
+            # search has started; only clear the slot if it is still ours
+            with self._search_lock:
+                if self._search is search:
+                    self._search = None
+
+        services = self.discovery.get_found_remote_services(types)
+        # A fresh scan also serves connects within the cache TTL
+        self._store_services(services)
+        return services
+
+    def _send_probe(self, types):
+        """Send a single WS-Discovery probe without waiting for answers."""
+        # search_services sends one probe per call; the short timeout makes
+        # it return right away, answers are collected by _on_probe_matches
+        self.discovery.search_services(
+            types=types, timeout=_PROBE_SEND_TIMEOUT)
+
+    def _on_probe_matches(self, services):
+        """Record how long each device took to first answer the running search."""
+        now = time.monotonic()
+        with self._search_lock:
+            if self._search is None:
+                return
+            started, responded, answered = self._search
+            for service in services:
+                if service.epr not in responded:
+                    responded[service.epr] = now
+                    self._response_times.record(now - started)
+                    answered.set()
+
+    def find_services(self, timeout: int = None) -> Dict[str, Any]:
+        """
+        Search for WS-Discovery services and index them by EPR.
+
+        Scans are cached for settings.SERVICE_CACHE_TTL seconds, so concurrent
+        callers share one scan instead of each blocking for the full timeout.
+
+        Args:
+            timeout: Search timeout in seconds
+
+        Returns:
+            Dict of {epr: wsd_service}
+        """
+        if self._state != _RUNNING:
+            raise RuntimeError("Discovery service not started")
+
+        with self._services_lock:
+            age = time.monotonic() - self._services_scanned_at
+            if age < settings.SERVICE_CACHE_TTL:
+                return self._services_by_epr
+
+            services = self.discovery.search_services(
+                timeout=timeout or settings.DISCOVERY_TIMEOUT)
+            self._services_by_epr = {service.epr: service for service in services}
+            self._services_scanned_at = time.monotonic()
+            return self._services_by_epr
+
+    def _store_services(self, services):
+        """Replace the cached service index with a fresh scan."""
+        with self._services_lock:
+            self._services_by_epr = {service.epr: service for service in services}
+            self._services_scanned_at = time.monotonic()
+
     def _create_device_from_service(self, service) -> Device:
         """
         Create Device object from WS-Discovery service.
@@ -95,128 +305,147 @@ class DiscoveryService:
         Returns:
             Device object with extracted information
         """
-        # Extract basic info
         epr = service.epr
-        ip_address = self._extract_ip_address(service)
-
-        # Extract location from scopes
-        location = self._extract_location_from_scopes(service)
-
-        # Create device with discovered information
-        device = Device(
-            epr=epr,
-            name=self._extract_device_name(service),
-            ip_address=ip_address,
-            status=DeviceStatus.DISCOVERED,
-            location=location,
-            xaddrs=service.xaddrs if hasattr(service, 'xaddrs') else None,
-            scopes=self._extract_scopes(service)
-        )
-
-        return device
-
-    def _extract_device_name(self, service) -> str:
-        """Extract device name from service info."""
-        # Try to get name from scopes or use part of EPR
-        if hasattr(service, 'epr'):
-            epr = service.epr
-            if epr.startswith('urn:uuid:'):
-                return f"Device-{epr.replace('urn:uuid:', '')[:8]}"
-        return "Unknown Device"
-
-    def _extract_ip_address(self, service) -> str:
-        """Extract IP address from service xAddrs."""
-        try:
-            if hasattr(service, 'xaddrs') and service.xaddrs:
-                addr = service.xaddrs[0]
-                # Extract IP from URL like "http://192.168.1.100:8080/..."
-                if '://' in addr:
-                    addr = addr.split('://')[1]
-                if ':' in addr:
-                    addr = addr.split(':')[0]
-                if '/' in addr:
-                    addr = addr.split('/')[0]
-                return addr
-        except Exception as e:
-            logger.debug(f"Could not extract IP address: {e}")
-        return None
+        scopes = self._extract_scopes(service)
+        signature = (tuple(service.x_addrs or ()), tuple(scopes))
+
+        cached = self._fields_cache.get(epr)
+        if cached is not None and cached[0] == signature:
+            fields = cached[1]
+        else:
+            fields = self._extract_service_fields(service, scopes)
+            self._fields_cache.pop(epr, None)
+            if len(self._fields_cache) >= _FIELDS_CACHE_SIZE:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._fields_cache[next(iter(self._fields_cache))]
+            self._fields_cache[epr] = (signature, fields)
+
+        # Fresh Device per search so connection state is never shared
+        return Device(status=DeviceStatus.DISCOVERED, **fields)
+
+    def _extract_service_fields(self, service, scopes: list) -> dict:
+        """
+        Extract Device fields from a WSD service in a single pass.
+
+        xAddrs and scopes are each read once and shared by the name, IP
+        address and location extraction.
+
+        Args:
+            service: WSD service object
+            scopes: Scope strings as returned by _extract_scopes
 
-    def _extract_location_from_scopes(self, service) -> LocationInfo:
+        Returns:
+            Dict of Device keyword arguments
+        """
+        epr = service.epr
+        # sdc11073's Service exposes its transport addresses as x_addrs
+        xaddrs = service.x_addrs
+
+        # Name from the UUID part of the EPR
+        if epr.startswith('urn:uuid:'):
+            name = f"Device-{epr[9:17]}"
+        else:
+            name = "Unknown Device"
+
+        # IP from the first xAddr, e.g. "http://192.168.1.100:8080/..."
+        ip_address = self._parse_xaddr_host(xaddrs[0]) if xaddrs else None
+
+        return {
+            'epr': epr,
+            'name': name,
+            'ip_address': ip_address,
+            'location': self._extract_location_from_scopes(scopes),
+            'xaddrs': xaddrs,
+            'scopes': scopes,
+        }
+
+    @staticmethod
+    def _parse_xaddr_host(addr: str) -> str:
+        """
+        Get the host of a "scheme://host[:port]/path" xAddr.
+
+        Bracketed IPv6 literals ("http://[fe80::1]:6464/...") are returned
+        without brackets or port.
+        """
+        i = addr.find('://')
+        start = i + 3 if i >= 0 else 0
+        j = addr.find('/', start)
+        host = addr[start:j] if j >= 0 else addr[start:]
+
+        if host.startswith('['):
+            k = host.find(']')
+            return host[1:k] if k >= 0 else host[1:]
+        k = host.rfind(':')
+        return host[:k] if k >= 0 else host
+
+    def _extract_location_from_scopes(self, scope_list: list) -> LocationInfo:
         """
         Extract location information from WS-Discovery scopes.
         Parses SDC location scope format.
+
+        Args:
+            scope_list: Scope strings as returned by _extract_scopes
         """
         location = LocationInfo()
-
-        try:
-            if not hasattr(service, 'scopes'):
-                return location
-
-            scopes = service.scopes
-
-            # Handle ScopesType object - convert to list of strings
-            scope_list = []
-            if hasattr(scopes, '__iter__') and not isinstance(scopes, str):
-                # It's iterable (likely a list)
-                scope_list = list(scopes)
-            elif hasattr(scopes, 'text'):
-                # It's a single scope with text attribute
-                scope_list = [scopes.text]
-            else:
-                # Try to convert to string
-                scope_list = [str(scopes)]
-
-            for scope in scope_list:
-                scope_str = str(scope)
-
-                # Parse location scope: sdc.ctxt.loc:/sdc.ctxt.loc.detail/...
-                if 'sdc.ctxt.loc' in scope_str and '?' in scope_str:
-                    # Extract query parameters
-                    query_part = scope_str.split('?')[1]
-                    query = query_part.split(',')[0]
-
-                    print(f"%$$$%%%%%%%:{query}")
-
-                    params = {}
-
-                    for param in query.split('&'):
-                        if '=' in param:
-                            key, value = param.split('=', 1)
-                            params[key.lower()] = unquote(value)
-
-                    # Map parameters to LocationInfo
-                    location.facility = params.get('fac')
-                    location.poc = params.get('poc')
-                    location.bed = params.get('bed')
-                    location.room = params.get('rm')
-                    location.building = params.get('bldng')
-                    location.floor = params.get('flr')
-
-                    logger.debug(f"Extracted location: {location}")
-                    break
-
-        except Exception as e:
-            logger.debug(f"Could not extract location from scopes: {e}")
+        marker = self._LOC_SCOPE_MARKER
+
+        # Most scopes are not location scopes; filter on the marker before
+        # doing any parsing work
+        location_scopes = [scope for scope in scope_list if marker in scope]
+        if not location_scopes:
+            return location
+
+        fields = self._LOC_FIELDS
+        for scope_str in location_scopes:
+            # Parse location scope: sdc.ctxt.loc:/sdc.ctxt.loc.detail/...?fac=..&bed=..
+            find = scope_str.find
+            q = find('?')
+            if q < 0:
+                continue
+            end = find(',', q)
+            if end < 0:
+                end = len(scope_str)
+            logger.debug("Location scope query: %s", scope_str[q + 1:end])
+
+            # Walk the &-separated key=value pairs in place
+            i = q + 1
+            while i < end:
+                amp = find('&', i, end)
+                if amp < 0:
+                    amp = end
+                eq = find('=', i, amp)
+                if eq >= 0:
+                    field_name = fields.get(scope_str[i:eq].lower())
+                    if field_name:
+                        value = scope_str[eq + 1:amp]
+                        if '%' in value:
+                            value = unquote(value)
+                        setattr(location, field_name, value)
+                i = amp + 1
+
+            logger.debug("Extracted location: %s", location)
+            break
 
         return location
 
     def _extract_scopes(self, service) -> list:
         """Extract and convert scopes to list of strings."""
-        try:
-            if not hasattr(service, 'scopes'):
-                return []
-
-            scopes = service.scopes
+        scopes = getattr(service, 'scopes', None)
+        if scopes is None:
+            return []
 
-            # Convert to list of strings
-            if hasattr(scopes, '__iter__') and not isinstance(scopes, str):
-                return [str(s) for s in scopes]
-            else:
-                return [str(scopes)]
+        # ScopesType keeps the scope URIs in its text list
+        text = getattr(scopes, 'text', None)
+        if text is not None:
+            scopes = text
 
-        except Exception as e:
-            logger.debug(f"Could not extract scopes: {e}")
-            return []
+        # Convert to list of strings
+        if isinstance(scopes, str):
+            return [scopes]
+        try:
+            return [str(s) for s in scopes]
+        except TypeError:
+            return [str(scopes)]
 
     def __enter__(self):
         """Context manager entry."""
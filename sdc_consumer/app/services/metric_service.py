@@ -1,9 +1,10 @@
 """Service for processing and storing metric data."""
 import logging
-from collections import deque
-from typing import Dict, List, Callable
-from datetime import datetime
+import time
+from array import array
+from typing import Dict, List, Callable, Set, Tuple
 from models.metric import MetricData
+from utils.ring_buffer import RingBuffer
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -20,10 +21,19 @@ class MetricService:
             max_points: Maximum number of data points to store per metric
         """
         self.max_points = max_points or settings.CHART_MAX_POINTS
-        # Store metric history: {handle: deque([MetricData, ...])}
-        self._metric_history: Dict[str, deque] = {}
-        # Callbacks to notify on metric updates: [callback_func, ...]
-        self._update_callbacks: List[Callable] = []
+        # Metric history as parallel per-handle ring buffers (structure of
+        # arrays): float values and ns timestamps
+        self._values: Dict[str, RingBuffer] = {}
+        self._times: Dict[str, RingBuffer] = {}
+        # Name and unit of the last sample per handle: {handle: (name, unit)}
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        # Name and unit resolved from descriptors, which are static per
+        # connection: {handle: (name, unit)}
+        self._descriptor_cache: Dict[str, Tuple[str, str]] = {}
+        # Callbacks to notify on metric updates: {callback_func, ...}
+        self._update_callbacks: Set[Callable] = set()
+        # Handles whose history is kept even while no callback is registered
+        self._tracked_handles: Set[str] = set()
 
     def process_metric_update(self, metrics_by_handle: dict, connection_service):
         """
@@ -33,51 +43,62 @@ class MetricService:
             metrics_by_handle: Dict of {handle: metric_state}
             connection_service: ConnectionService to get descriptor info
         """
+        has_subs = bool(self._update_callbacks)
+        tracked = self._tracked_handles
+        if not has_subs and not tracked:
+            return
+
+        # The whole report is handled in one pass: it shares a single
+        # timestamp, and per-update lookups are hoisted out of the loop
+        timestamp = time.time_ns()
+        descriptor_cache = self._descriptor_cache
+        add_to_history = self._add_to_history
         updated_metrics = []
+        append_update = updated_metrics.append
 
         for handle, metric_state in metrics_by_handle.items():
+            if not has_subs and handle not in tracked:
+                continue
+
             try:
                 # Skip if no metric value
-                if not hasattr(metric_state, 'MetricValue') or metric_state.MetricValue is None:
-                    continue
-
-                value = metric_state.MetricValue.Value
-
-                # Get descriptor for unit and name
-                descriptor = connection_service.get_metric_descriptor(handle)
-                if descriptor is None:
-                    logger.warning(f"No descriptor found for metric {handle}")
+                metric_value = getattr(metric_state, 'MetricValue', None)
+                if metric_value is None:
                     continue
 
-                # Get unit
-                unit = ""
-                if hasattr(descriptor, 'Unit') and descriptor.Unit:
-                    unit = descriptor.Unit.Code if hasattr(
-                        descriptor.Unit, 'Code') else str(descriptor.Unit)
-
-                # Get name - try multiple sources
-                name = self._get_metric_name(handle, descriptor)
+                # Name and unit come from the descriptor, resolved once per handle
+                meta = descriptor_cache.get(handle)
+                if meta is None:
+                    descriptor = connection_service.get_metric_descriptor(handle)
+                    if descriptor is None:
+                        logger.warning("No descriptor found for metric %s", handle)
+                        continue
+                    meta = descriptor_cache[handle] = (
+                        self._get_metric_name(handle, descriptor),
+                        self._get_metric_unit(descriptor)
+                    )
 
-                # Create metric data object
                 metric_data = MetricData(
-                    handle=handle,
-                    name=name,
-                    value=float(value),
-                    unit=unit,
-                    timestamp=datetime.now()
-                )
+                    handle, meta[0], float(metric_value.Value), meta[1], timestamp)
 
                 # Store in history
-                self._add_to_history(metric_data)
-                updated_metrics.append(metric_data)
+                add_to_history(metric_data)
+                append_update(metric_data)
 
             except Exception as e:
-                logger.error(f"Error processing metric {handle}: {e}")
+                logger.error("Error processing metric %s: %s", handle, e)
 
         # Notify callbacks
         if updated_metrics:
             self._notify_callbacks(updated_metrics)
 
+    def _get_metric_unit(self, descriptor) -> str:
+        """Extract the unit code from a metric descriptor."""
+        unit = getattr(descriptor, 'Unit', None)
+        if not unit:
+            return ""
+        return unit.Code if hasattr(unit, 'Code') else str(unit)
+
     def _get_metric_name(self, handle: str, descriptor) -> str:
         """Extract metric name from various sources."""
         from config.settings import settings
@@ -99,15 +120,19 @@ class MetricService:
         return name
 
     def _add_to_history(self, metric_data: MetricData):
-        """Add metric data to history, maintaining max_points limit."""
+        """Add metric data to history, overwriting the oldest point when full."""
         handle = metric_data.handle
 
-        if handle not in self._metric_history:
-            self._metric_history[handle] = deque(maxlen=self.max_points)
+        values = self._values.get(handle)
+        if values is None:
+            values = self._values[handle] = RingBuffer(self.max_points, 'd')
+            self._times[handle] = RingBuffer(self.max_points, 'q')
 
-        self._metric_history[handle].append(metric_data)
+        values.append(metric_data.value)
+        self._times[handle].append(metric_data.timestamp)
+        self._meta[handle] = (metric_data.name, metric_data.unit)
 
-    def get_metric_history(self, handle: str, limit: int = None) -> List[MetricData]:
+    def get_metric_history(self, handle: str, limit: int = None) -> Tuple[array, array]:
         """
         Get historical data for a metric.
 
@@ -116,15 +141,15 @@ class MetricService:
             limit: Maximum number of recent points to return
 
         Returns:
-            List of MetricData objects
+            Tuple of (timestamps, values) arrays in chronological order,
+            timestamps as nanoseconds since the epoch
         """
-        if handle not in self._metric_history:
-            return []
+        values = self._values.get(handle)
+        if values is None:
+            return array('q'), array('d')
 
-        history = list(self._metric_history[handle])
-        if limit:
-            history = history[-limit:]
-        return history
+        return (self._times[handle].as_contiguous(limit),
+                values.as_contiguous(limit))
 
     def get_latest_metric(self, handle: str) -> MetricData:
         """
@@ -136,16 +161,35 @@ class MetricService:
         Returns:
             Latest MetricData or None
         """
-        history = self.get_metric_history(handle)
-        return history[-1] if history else None
+        values = self._values.get(handle)
+        if not values:
+            return None
+
+        name, unit = self._meta[handle]
+        return MetricData(
+            handle=handle,
+            name=name,
+            value=values.last(),
+            unit=unit,
+            timestamp=self._times[handle].last()
+        )
 
     def get_all_latest_metrics(self) -> Dict[str, MetricData]:
         """Get the latest value for all tracked metrics."""
         return {
             handle: self.get_latest_metric(handle)
-            for handle in self._metric_history.keys()
+            for handle, values in self._values.items() if values
         }
 
+    def track_handle(self, handle: str):
+        """
+        Keep history for a metric even while no callback is registered.
+
+        Args:
+            handle: Metric handle
+        """
+        self._tracked_handles.add(handle)
+
     def register_callback(self, callback: Callable):
         """
         Register a callback to be notified of metric updates.
@@ -153,17 +197,16 @@ class MetricService:
         Args:
             callback: Function(List[MetricData]) to call on updates
         """
-        if callback not in self._update_callbacks:
-            self._update_callbacks.append(callback)
+        self._update_callbacks.add(callback)
 
     def unregister_callback(self, callback: Callable):
         """Unregister a callback."""
-        if callback in self._update_callbacks:
-            self._update_callbacks.remove(callback)
+        self._update_callbacks.discard(callback)
 
     def _notify_callbacks(self, metrics: List[MetricData]):
         """Notify all registered callbacks of metric updates."""
-        for callback in self._update_callbacks:
+        # Snapshot so callbacks may (un)register while being notified
+        for callback in tuple(self._update_callbacks):
             try:
                 callback(metrics)
             except Exception as e:
@@ -177,6 +220,10 @@ class MetricService:
             handle: Specific metric to clear, or None to clear all
         """
         if handle:
-            self._metric_history.pop(handle, None)
+            for store in (self._values, self._times, self._meta,
+                          self._descriptor_cache):
+                store.pop(handle, None)
         else:
-            self._metric_history.clear()
+            for store in (self._values, self._times, self._meta,
+                          self._descriptor_cache):
+                store.clear()
@@ -0,0 +1,81 @@
+"""Tests for turning WS-Discovery services into Devices."""
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from sdc11073.wsdiscovery.service import Service
+from models.device import DeviceStatus
+from services.discovery_service import DiscoveryService
+
+EPR = 'urn:uuid:cc013678-79f6-403c-998f-3cc0cc050230'
+
+
+class CreateDeviceFromServiceTest(unittest.TestCase):
+    """DiscoveryService._create_device_from_service"""
+
+    def setUp(self):
+        self.service = DiscoveryService()
+
+    def test_service_without_xaddrs_is_listed_without_ip(self):
+        wsd_service = Service(types=None, scopes=None, x_addrs=None,
+                              epr=EPR, instance_id='1')
+
+        device = self.service._create_device_from_service(wsd_service)
+
+        self.assertEqual(device.epr, EPR)
+        self.assertIsNone(device.ip_address)
+        self.assertIs(device.status, DeviceStatus.DISCOVERED)
+
+    def test_none_xaddrs_attribute_is_tolerated(self):
+        # ProbeMatch data read straight from the wire may carry None
+        wsd_service = SimpleNamespace(epr=EPR, x_addrs=None, scopes=None)
+
+        device = self.service._create_device_from_service(wsd_service)
+
+        self.assertIsNone(device.ip_address)
+
+    def test_ip_is_taken_from_first_xaddr(self):
+        wsd_service = Service(types=None, scopes=None,
+                              x_addrs=['http://192.168.1.100:6464/device'],
+                              epr=EPR, instance_id='1')
+
+        device = self.service._create_device_from_service(wsd_service)
+
+        self.assertEqual(device.ip_address, '192.168.1.100')
+
+
+
+class _IdleDiscovery:
+    """WS-Discovery stand-in that sends probes nobody answers."""
+
+    def search_services(self, types=None, scopes=None, timeout=5,
+                        repeat_probe_interval=3):
+        time.sleep(timeout)
+        return []
+
+    def get_found_remote_services(self, types=None, scopes=None):
+        return []
+
+
+class ScanMedicalDevicesTest(unittest.TestCase):
+    """DiscoveryService._scan_medical_devices"""
+
+    def test_late_scan_keeps_newer_search_state(self):
+        service = DiscoveryService()
+        service.discovery = _IdleDiscovery()
+        scan = threading.Thread(
+            target=service._scan_medical_devices, args=(0.3,))
+        scan.start()
+        time.sleep(0.1)
+
+        # A newer search takes the slot while the old scan still runs
+        newer = (time.monotonic(), {}, threading.Event())
+        with service._search_lock:
+            service._search = newer
+        scan.join()
+
+        self.assertIs(service._search, newer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Timeout derived from recently observed response times."""
+from collections import deque
+from statistics import quantiles
+from typing import Optional
+
+
+class AdaptiveTimeout:
+    """
+    Tracks response times and suggests a cutoff at their 90th percentile.
+
+    The cutoff is only suggested once enough samples have been recorded;
+    callers fall back to their fixed timeout until then.
+    """
+
+    def __init__(self, minimum: float = 0.3, factor: float = 1.5,
+                 min_samples: int = 16, window: int = 256):
+        """
+        Initialize adaptive timeout.
+
+        Args:
+            minimum: Lower bound of the suggested timeout in seconds
+            factor: Safety margin applied to the 90th percentile
+            min_samples: Samples needed before a timeout is suggested
+            window: Number of most recent samples kept
+        """
+        self.minimum = minimum
+        self.factor = factor
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Record the response time of one successful request."""
+        self._samples.append(seconds)
+
+    def get(self) -> Optional[float]:
+        """
+        Get the suggested timeout.
+
+        Returns:
+            Timeout in seconds, or None while there are too few samples
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        p90 = quantiles(self._samples, n=10)[8]
+        return max(self.minimum, p90 * self.factor)
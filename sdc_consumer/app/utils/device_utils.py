@@ -1,14 +1,74 @@
 """Utility functions for working with connected devices."""
 import logging
-from typing import Optional, List, Dict, Any
+import time
+import weakref
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional, List, Dict, Any, Tuple
+from sdc11073.xml_types import pm_qnames as pm
 from models.device import Device
+from utils.adaptive_timeout import AdaptiveTimeout
 
 logger = logging.getLogger(__name__)
 
+# Metric units resolved per MDIB: {mdib: {handle: unit}}; entries go away
+# with the MDIB when a device disconnects
+_UNIT_CACHE: "weakref.WeakKeyDictionary[Any, Dict[str, str]]" = weakref.WeakKeyDictionary()
+
+# Upper bound in seconds for an operation invocation to complete
+_INVOKE_TIMEOUT = 10
+# Completion times of invocations per operation, used to spot unusually slow
+# calls: {(epr, operation_handle): AdaptiveTimeout}
+_INVOKE_TIMES: Dict[Tuple[str, str], AdaptiveTimeout] = {}
+
 
 class DeviceHelper:
     """Helper class for common device operations."""
 
+    @staticmethod
+    def _snapshot(device: Device) -> Dict[str, Any]:
+        """
+        Index the device's numeric metric states by handle in one pass.
+
+        Args:
+            device: Connected Device object
+
+        Returns:
+            Dictionary of {descriptor_handle: metric_state}
+        """
+        states = device.mdib.states
+        # NODETYPE is keyed by the state's QName, not its type name
+        with states.lock:
+            return {state.DescriptorHandle: state
+                    for state in states.NODETYPE.get(pm.NumericMetricState, ())}
+
+    @staticmethod
+    def _indexes(device: Device) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Get the device's state and descriptor lookups by handle.
+
+        States and descriptors are updated in place by metric and
+        description reports, so the lookups are only rebuilt when
+        descriptors are added or removed or the MDIB sequence restarts.
+
+        Args:
+            device: Connected Device object
+
+        Returns:
+            Tuple of ({descriptor_handle: state}, {handle: descriptor})
+        """
+        mdib = device.mdib
+        descriptions = mdib.descriptions
+        key = (mdib.sequence_id, len(descriptions.objects))
+        if key != device._index_key:
+            with descriptions.lock:
+                device._descriptor_index = {
+                    d.Handle: d for d in descriptions.objects}
+            with mdib.states.lock:
+                device._state_index = {
+                    s.DescriptorHandle: s for s in mdib.states.objects}
+            device._index_key = key
+        return device._state_index, device._descriptor_index
+
     @staticmethod
     def get_all_metrics(device: Device) -> Dict[str, Any]:
         """
@@ -21,19 +81,15 @@ class DeviceHelper:
             Dictionary of {handle: metric_state}
         """
         if not device.is_connected() or not device.mdib:
-            logger.warning(f"Device {device.epr} is not connected")
+            logger.warning("Device %s is not connected", device.epr)
             return {}
 
         try:
-            metrics = {}
-            # Get all numeric metric states
-            for state in device.mdib.states.NODETYPE.get('NumericMetricState', []):
-                if hasattr(state, 'MetricValue') and state.MetricValue is not None:
-                    metrics[state.Handle] = state
-
-            return metrics
+            return {handle: state
+                    for handle, state in DeviceHelper._snapshot(device).items()
+                    if getattr(state, 'MetricValue', None) is not None}
         except Exception as e:
-            logger.error(f"Error getting metrics from device: {e}")
+            logger.error("Error getting metrics from device: %s", e)
             return {}
 
     @staticmethod
@@ -52,11 +108,11 @@ class DeviceHelper:
             return None
 
         try:
-            state = device.mdib.states.handle.get_one(handle, allow_none=True)
+            state = DeviceHelper._indexes(device)[0].get(handle)
             if state and hasattr(state, 'MetricValue') and state.MetricValue:
                 return float(state.MetricValue.Value)
         except Exception as e:
-            logger.error(f"Error getting metric {handle}: {e}")
+            logger.error("Error getting metric %s: %s", handle, e)
 
         return None
 
@@ -76,9 +132,9 @@ class DeviceHelper:
             return None
 
         try:
-            return device.mdib.descriptions.handle.get_one(handle, allow_none=True)
+            return DeviceHelper._indexes(device)[1].get(handle)
         except Exception as e:
-            logger.error(f"Error getting descriptor for {handle}: {e}")
+            logger.error("Error getting descriptor for %s: %s", handle, e)
             return None
 
     @staticmethod
@@ -93,19 +149,29 @@ class DeviceHelper:
         Returns:
             Unit string (e.g., 'bpm', '%', '°C')
         """
+        units = _UNIT_CACHE.get(device.mdib) if device.mdib else None
+        if units is not None and handle in units:
+            return units[handle]
+
         descriptor = DeviceHelper.get_metric_descriptor(device, handle)
-        if descriptor and hasattr(descriptor, 'Unit') and descriptor.Unit:
-            if hasattr(descriptor.Unit, 'Code'):
-                return descriptor.Unit.Code
-        return ""
+        if not descriptor:
+            return ""
+
+        unit = getattr(descriptor, 'Unit', None)
+        code = getattr(unit, 'Code', None) if unit else None
+        # Units are fixed per descriptor; remember them for this MDIB
+        _UNIT_CACHE.setdefault(device.mdib, {})[handle] = code or ""
+        return code or ""
 
     @staticmethod
-    def get_all_metric_handles(device: Device) -> List[str]:
+    def get_all_metric_handles(device: Device,
+                               snapshot: Dict[str, Any] = None) -> List[str]:
         """
         Get all available metric handles from a device.
 
         Args:
             device: Connected Device object
+            snapshot: Result of _snapshot(device) if the caller already has it
 
         Returns:
             List of metric handles
@@ -114,12 +180,11 @@ class DeviceHelper:
             return []
 
         try:
-            handles = []
-            for state in device.mdib.states.NODETYPE.get('NumericMetricState', []):
-                handles.append(state.Handle)
-            return handles
+            if snapshot is None:
+                snapshot = DeviceHelper._snapshot(device)
+            return list(snapshot)
         except Exception as e:
-            logger.error(f"Error getting metric handles: {e}")
+            logger.error("Error getting metric handles: %s", e)
             return []
 
     @staticmethod
@@ -136,27 +201,49 @@ class DeviceHelper:
             True if successful, False otherwise
         """
         if not device.is_connected() or not device.client:
-            logger.warning(f"Device {device.epr} is not connected")
+            logger.warning("Device %s is not connected", device.epr)
             return False
 
         try:
             # Get the operation from MDIB
-            operation = device.mdib.descriptions.handle.get_one(
-                operation_handle, allow_none=True)
+            operation = DeviceHelper._indexes(device)[1].get(operation_handle)
             if not operation:
-                logger.error(f"Operation {operation_handle} not found")
+                logger.error("Operation %s not found", operation_handle)
                 return False
 
-            # Invoke the operation
+            times = _INVOKE_TIMES.get((device.epr, operation_handle))
+            if times is None:
+                times = _INVOKE_TIMES[(device.epr, operation_handle)] = \
+                    AdaptiveTimeout(minimum=1.0)
+            expected = times.get()
+
+            # Invoke the operation; past the time this operation usually
+            # needs, keep waiting up to the fixed timeout
+            started = time.monotonic()
             future = device.client.invoke_operation(
                 operation_handle, arguments or {})
-            result = future.result(timeout=10)
-
-            logger.info(f"Operation {operation_handle} invoked successfully")
+            try:
+                if expected is not None and expected < _INVOKE_TIMEOUT:
+                    try:
+                        future.result(timeout=expected)
+                    except FutureTimeoutError:
+                        logger.warning(
+                            "Operation %s is taking longer than usual (%.1fs)",
+                            operation_handle, expected)
+                        future.result(timeout=_INVOKE_TIMEOUT - expected)
+                else:
+                    future.result(timeout=_INVOKE_TIMEOUT)
+            except FutureTimeoutError:
+                # Count the timeout so the estimate can grow again
+                times.record(_INVOKE_TIMEOUT)
+                raise
+            times.record(time.monotonic() - started)
+
+            logger.info("Operation %s invoked successfully", operation_handle)
             return True
 
         except Exception as e:
-            logger.error(f"Error invoking operation {operation_handle}: {e}")
+            logger.error("Error invoking operation %s: %s", operation_handle, e)
             return False
 
     @staticmethod
@@ -173,8 +260,9 @@ class DeviceHelper:
         if not device.is_connected() or not device.mdib:
             return {}
 
+        snapshot = DeviceHelper._snapshot(device)
         capabilities = {
-            'metrics': len(DeviceHelper.get_all_metric_handles(device)),
+            'metrics': len(DeviceHelper.get_all_metric_handles(device, snapshot)),
             'has_location': device.location is not None,
             'manufacturer': device.manufacturer,
             'model': device.model_number,
@@ -194,39 +282,32 @@ class DeviceHelper:
         Returns:
             Formatted string with device summary
         """
-        summary = [
-            "=" * 60,
-            f"Device: {device.get_display_name()}",
-            "=" * 60,
-        ]
-
-        if device.manufacturer:
-            summary.append(f"Manufacturer: {device.manufacturer}")
-        if device.model_number:
-            summary.append(f"Model: {device.model_number}")
-        if device.serial_number:
-            summary.append(f"Serial Number: {device.serial_number}")
-        if device.firmware_version:
-            summary.append(f"Firmware: {device.firmware_version}")
-
-        summary.append(f"Status: {device.status.value}")
-        summary.append(f"EPR: {device.epr}")
-
-        if device.ip_address:
-            summary.append(f"IP: {device.ip_address}")
-
-        if device.location:
-            summary.append(f"Location: {device.location}")
-
-        if device.is_connected():
-            metrics = DeviceHelper.get_all_metric_handles(device)
+        rule = "=" * 60
+        summary = [rule, f"Device: {device.get_display_name()}", rule]
+
+        # Optional fields in display order, skipped when unset
+        fields = (
+            ("Manufacturer", device.manufacturer),
+            ("Model", device.model_number),
+            ("Serial Number", device.serial_number),
+            ("Firmware", device.firmware_version),
+            ("Status", device.status.display),
+            ("EPR", device.epr),
+            ("IP", device.ip_address),
+            ("Location", device.location),
+        )
+        summary.extend(f"{label}: {value}" for label, value in fields if value)
+
+        if device.is_connected() and device.mdib:
+            snapshot = DeviceHelper._snapshot(device)
+            metrics = DeviceHelper.get_all_metric_handles(device, snapshot)
             summary.append(f"Available Metrics: {len(metrics)}")
             if metrics:
                 summary.append("  " + ", ".join(metrics[:5]))
                 if len(metrics) > 5:
                     summary.append(f"  ... and {len(metrics) - 5} more")
 
-        summary.append("=" * 60)
+        summary.append(rule)
         return "\n".join(summary)
 
 
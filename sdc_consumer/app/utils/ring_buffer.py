@@ -0,0 +1,65 @@
+"""Fixed-size ring buffer backed by a preallocated array."""
+from array import array
+
+
+class RingBuffer:
+    """Keeps the most recent items, overwriting the oldest when full."""
+
+    __slots__ = ('_data', '_capacity', '_head', '_count')
+
+    def __init__(self, capacity: int, typecode: str = 'd'):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of items to keep
+            typecode: array module typecode of the items ('d' float, 'q' int64)
+        """
+        self._data = array(typecode, [0]) * capacity
+        self._capacity = capacity
+        self._head = 0  # Next write index
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value):
+        """Add an item, replacing the oldest one when the buffer is full."""
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def last(self):
+        """
+        Get the most recently added item.
+
+        Raises:
+            IndexError: If the buffer is empty
+        """
+        if not self._count:
+            raise IndexError("last() on empty RingBuffer")
+        return self._data[self._head - 1]
+
+    def as_contiguous(self, limit: int = None) -> array:
+        """
+        Get items in insertion order as a new array.
+
+        Args:
+            limit: Maximum number of most recent items to return
+
+        Returns:
+            Array of items, oldest first
+        """
+        count = min(self._count, limit) if limit else self._count
+        start = self._head - count
+        if start >= 0:
+            return self._data[start:self._head]
+
+        # Window wraps around the end of the storage
+        return self._data[start:] + self._data[:self._head]
+
+    def clear(self):
+        """Remove all items."""
+        self._head = 0
+        self._count = 0
@@ -1,7 +1,8 @@
 """Component for displaying real-time metric charts."""
+import time
 from nicegui import ui
-from datetime import datetime
-from collections import deque
+from config.settings import settings
+from utils.ring_buffer import RingBuffer
 
 
 class MetricChart:
@@ -22,8 +23,23 @@ class MetricChart:
         self.color = color
         self.max_points = max_points
         self.chart = None
-        self.data_points = deque(maxlen=max_points)
-        self.time_labels = deque(maxlen=max_points)
+        # The trace dict mutated on each flush (bound once the chart exists)
+        self._trace = None
+        # ui.plotly.run_plot_method needs NiceGUI 3.13; older releases
+        # resend the whole figure instead of extending the trace
+        self._can_extend = False
+        self._fill_color = self._get_fill_color()
+        # Preallocated value/timestamp (ns) rings; labels are formatted at flush
+        self.data_points = RingBuffer(max_points, 'd')
+        self.timestamps = RingBuffer(max_points, 'q')
+        # Points added since the last push to the browser, sent as a delta
+        self._pending_times: list[int] = []
+        self._pending_y: list[float] = []
+        # Set when the whole trace must be resent (history load, clear)
+        self._full_refresh = False
+        # Last formatted time label, reused while the wall-clock second is unchanged
+        self._last_sec = None
+        self._last_label = ''
 
         # Chart configuration (created once)
         self.chart_config = {
@@ -35,7 +51,7 @@ class MetricChart:
                 'line': {'color': self.color, 'width': 3},
                 'marker': {'size': 4, 'color': self.color},
                 'fill': 'tozeroy',
-                'fillcolor': self._get_fill_color(),
+                'fillcolor': self._fill_color,
                 'name': self.title,
             }],
             'layout': {
@@ -69,33 +85,97 @@ class MetricChart:
 
             # Create the chart using plotly
             self.chart = ui.plotly(self.chart_config).classes('w-full')
+            self._trace = self.chart.figure['data'][0]
+            self._can_extend = hasattr(self.chart, 'run_plot_method')
+
+            # Coalesce data points into one browser update per interval
+            ui.timer(settings.CHART_FLUSH_INTERVAL, self._flush)
 
         return self
 
-    def add_data_point(self, value: float, timestamp: datetime = None):
+    def add_data_point(self, value: float, timestamp: int = None):
         """
         Add a new data point to the chart.
 
         Args:
             value: Metric value
-            timestamp: Time of reading (defaults to now)
+            timestamp: Time of reading in ns since the epoch (defaults to now)
         """
-        if timestamp is None:
-            timestamp = datetime.now()
+        ts = timestamp if timestamp is not None else time.time_ns()
 
-        # Add to deques (automatically removes oldest if at max_points)
+        # Add to rings (overwrites the oldest point if at max_points)
         self.data_points.append(value)
-        self.time_labels.append(timestamp.strftime('%H:%M:%S'))
+        self.timestamps.append(ts)
 
-        # Update chart data only (not layout)
-        if self.chart:
-            # Use Plotly's restyle method for efficient updates
-            # This only updates the data traces, not the entire figure
-            self.chart.figure['data'][0]['x'] = list(self.time_labels)
-            self.chart.figure['data'][0]['y'] = list(self.data_points)
+        # The chart itself is extended by the _flush timer
+        self._pending_times.append(ts)
+        self._pending_y.append(value)
+
+    def add_points_batch(self, points):
+        """
+        Add several data points, pushed to the browser by the next flush.
 
-            # Force update
-            self.chart.update()
+        Args:
+            points: Iterable of (value, timestamp) pairs, timestamps in ns
+                    since the epoch, oldest first
+        """
+        data_points = self.data_points
+        timestamps = self.timestamps
+        for value, ts in points:
+            data_points.append(value)
+            timestamps.append(ts)
+            self._pending_times.append(ts)
+            self._pending_y.append(value)
+
+    def set_history(self, times, values):
+        """
+        Replace the chart data with a history snapshot.
+
+        Args:
+            times: Timestamps in ns since the epoch
+            values: Metric values, parallel to times
+        """
+        self.data_points.clear()
+        self.timestamps.clear()
+        # Only the newest max_points fit in the rings
+        for ts, value in zip(times[-self.max_points:], values[-self.max_points:]):
+            self.timestamps.append(ts)
+            self.data_points.append(value)
+        self._full_refresh = True
+
+    def _format_time(self, ts: int) -> str:
+        """Format an epoch ns timestamp as HH:MM:SS, caching the last second."""
+        sec = ts // 1_000_000_000
+        if sec != self._last_sec:
+            self._last_sec = sec
+            self._last_label = time.strftime('%H:%M:%S', time.localtime(sec))
+        return self._last_label
+
+    def _flush(self):
+        """Push buffered data points to the browser in a single update."""
+        if not self.chart:
+            return
+
+        if self._full_refresh or (self._pending_times and not self._can_extend):
+            # The rings already hold the pending points
+            self._full_refresh = False
+            self._pending_times = []
+            self._pending_y = []
+            self._update_figure()
+        elif self._pending_times:
+            # Send only the new points; plotly trims the trace to max_points
+            times, self._pending_times = self._pending_times, []
+            y, self._pending_y = self._pending_y, []
+            x = [self._format_time(ts) for ts in times]
+            self.chart.run_plot_method(
+                'extendTraces', {'x': [x], 'y': [y]}, [0], self.max_points)
+
+    def _update_figure(self):
+        """Copy the buffered points into the figure and resend all of it."""
+        format_time = self._format_time
+        self._trace['x'] = [format_time(ts) for ts in self.timestamps.as_contiguous()]
+        self._trace['y'] = self.data_points.as_contiguous().tolist()
+        self.chart.update()
 
     def _get_fill_color(self):
         """Get a semi-transparent fill color based on the line color."""
@@ -109,11 +189,12 @@ class MetricChart:
     def clear(self):
         """Clear all data from the chart."""
         self.data_points.clear()
-        self.time_labels.clear()
+        self.timestamps.clear()
+        self._pending_times = []
+        self._pending_y = []
+        self._full_refresh = False
         if self.chart:
-            self.chart.figure['data'][0]['x'] = []
-            self.chart.figure['data'][0]['y'] = []
-            self.chart.update()
+            self._update_figure()
 
     def set_y_range(self, min_val: float, max_val: float):
         """
@@ -126,10 +207,10 @@ class MetricChart:
         if self.chart:
             self.chart.figure['layout']['yaxis']['range'] = [min_val, max_val]
             self.chart.figure['layout']['yaxis']['autorange'] = False
-            self.chart.update()
+            self._update_figure()
 
     def enable_auto_range(self):
         """Enable automatic Y-axis ranging."""
         if self.chart:
             self.chart.figure['layout']['yaxis']['autorange'] = True
-            self.chart.update()
+            self._update_figure()
@@ -1,10 +1,30 @@
 """Component for displaying a single vital sign value."""
 from nicegui import ui
 
+# Full card/icon class strings per color theme, built once at import
+_CARD_CLASSES = {
+    'red': 'w-full border-l-4 border-red-500 bg-red-50',
+    'blue': 'w-full border-l-4 border-blue-500 bg-blue-50',
+    'green': 'w-full border-l-4 border-green-500 bg-green-50',
+    'yellow': 'w-full border-l-4 border-yellow-500 bg-yellow-50',
+}
+_DEFAULT_CARD_CLASS = 'w-full border-l-4 border-gray-500 bg-gray-50'
+
+_ICON_CLASSES = {
+    'red': 'text-red-600',
+    'blue': 'text-blue-600',
+    'green': 'text-green-600',
+    'yellow': 'text-yellow-600',
+}
+_DEFAULT_ICON_CLASS = 'text-gray-600'
+
 
 class VitalDisplay:
     """Displays a vital sign with large readable numbers."""
 
+    # Value format by magnitude bucket, see update_value
+    _FORMATS = ('{:.2f}', '{:.1f}', '{:.0f}')
+
     def __init__(self, name: str, unit: str, icon: str = 'monitor_heart', color: str = 'blue'):
         """
         Initialize vital display component.
@@ -20,31 +40,18 @@ class VitalDisplay:
         self.icon = icon
         self.color = color
         self.value_label = None
+        self._last_text = None
+        self.icon_element = None
         self.card = None
 
     def render(self):
         """Render the vital display component."""
-        color_classes = {
-            'red': 'border-red-500 bg-red-50',
-            'blue': 'border-blue-500 bg-blue-50',
-            'green': 'border-green-500 bg-green-50',
-            'yellow': 'border-yellow-500 bg-yellow-50'
-        }
-
-        icon_colors = {
-            'red': 'text-red-600',
-            'blue': 'text-blue-600',
-            'green': 'text-green-600',
-            'yellow': 'text-yellow-600'
-        }
-
-        card_class = color_classes.get(
-            self.color, 'border-gray-500 bg-gray-50')
-        icon_class = icon_colors.get(self.color, 'text-gray-600')
+        color = self.color
 
-        with ui.card().classes(f'w-full border-l-4 {card_class}') as self.card:
+        with ui.card().classes(_CARD_CLASSES.get(color, _DEFAULT_CARD_CLASS)) as self.card:
             with ui.row().classes('w-full items-center'):
-                ui.icon(self.icon, size='lg').classes(icon_class)
+                self.icon_element = ui.icon(self.icon, size='lg').classes(
+                    _ICON_CLASSES.get(color, _DEFAULT_ICON_CLASS))
                 ui.label(self.name).classes('text-lg font-semibold ml-2')
 
             with ui.row().classes('w-full items-baseline mt-2'):
@@ -61,17 +68,20 @@ class VitalDisplay:
             value: New value to display
         """
         if self.value_label:
-            # Format based on value type
-            if value >= 100:
-                formatted_value = f'{value:.0f}'
-            elif value >= 10:
-                formatted_value = f'{value:.1f}'
-            else:
-                formatted_value = f'{value:.2f}'
+            # Fewer decimals as the value grows: <10, <100, >=100
+            formatted_value = self._FORMATS[
+                (value >= 10) + (value >= 100)].format(value)
 
-            self.value_label.text = formatted_value
+            # Identical readings are common (SpO2, temperature); skip the push
+            if formatted_value != self._last_text:
+                self._last_text = formatted_value
+                self.value_label.text = formatted_value
 
     def set_color(self, color: str):
         """Change the color theme of the component."""
         self.color = color
-        # Re-render would be needed for color change
+        if self.card:
+            self.card.classes(
+                replace=_CARD_CLASSES.get(color, _DEFAULT_CARD_CLASS))
+            self.icon_element.classes(
+                replace=_ICON_CLASSES.get(color, _DEFAULT_ICON_CLASS))
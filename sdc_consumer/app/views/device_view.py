@@ -1,5 +1,6 @@
 """Device monitoring view showing real-time vitals."""
 import logging
+from collections import defaultdict
 from nicegui import ui
 from typing import Callable, Dict
 from models.device import Device, MetricData
@@ -24,6 +25,8 @@ class DeviceView:
         self.on_back = on_back
         self.vital_displays: Dict[str, VitalDisplay] = {}
         self.charts: Dict[str, MetricChart] = {}
+        # Connection state shown in the header badge, to skip repeat updates
+        self._last_conn_state = 'connected'
 
     def render(self):
         """Render the device monitoring view."""
@@ -111,18 +114,39 @@ class DeviceView:
         Args:
             metrics: List of MetricData objects
         """
+        # Pass 1: group the batch by handle, keeping arrival order
+        points_by_handle = defaultdict(list)
         for metric in metrics:
-            # Update vital display
-            if metric.handle in self.vital_displays:
-                self.vital_displays[metric.handle].update_value(metric.value)
+            points_by_handle[metric.handle].append(
+                (metric.value, metric.timestamp))
 
-            # Update chart
-            if metric.handle in self.charts:
-                self.charts[metric.handle].add_data_point(
-                    metric.value, metric.timestamp)
+        # Pass 2: one update per display and chart
+        for handle, points in points_by_handle.items():
+            # Only the latest value is shown by the vital display
+            if handle in self.vital_displays:
+                self.vital_displays[handle].update_value(points[-1][0])
+
+            if handle in self.charts:
+                self.charts[handle].add_points_batch(points)
+
+    def show_connected(self):
+        """Show connected state."""
+        if self._last_conn_state == 'connected':
+            return
+        self._last_conn_state = 'connected'
+
+        self.connection_status.text = 'Connected'
+        self.connection_status.classes(
+            'bg-green-200 text-green-800',
+            remove='bg-red-200 text-red-800'
+        )
 
     def show_disconnected(self):
         """Show disconnected state."""
+        if self._last_conn_state == 'disconnected':
+            return
+        self._last_conn_state = 'disconnected'
+
         self.connection_status.text = 'Disconnected'
         self.connection_status.classes(
             'bg-red-200 text-red-800',
@@ -1,36 +1,92 @@
 """Main view for device discovery and selection."""
 import logging
+from functools import partial
+from types import MappingProxyType
 from nicegui import ui
-from typing import Callable
+from typing import Awaitable, Callable
 from models.device import Device, DeviceStatus
 
 logger = logging.getLogger(__name__)
 
+_BADGE_BASE = 'px-3 py-1 rounded-full text-sm'
+_BADGE_COLORS = MappingProxyType({
+    DeviceStatus.DISCOVERED: 'bg-gray-200 text-gray-800',
+    DeviceStatus.CONNECTING: 'bg-yellow-200 text-yellow-800',
+    DeviceStatus.CONNECTED: 'bg-green-200 text-green-800',
+    DeviceStatus.DISCONNECTED: 'bg-gray-300 text-gray-700',
+    DeviceStatus.ERROR: 'bg-red-200 text-red-800',
+})
+# Badge (text, classes) per status, built once at import
+_STATUS_BADGES = MappingProxyType({
+    status: (status.label,
+             f'{_BADGE_BASE} {_BADGE_COLORS.get(status, "bg-gray-200 text-gray-800")}')
+    for status in DeviceStatus
+})
+_DEFAULT_BADGE_CLASSES = f'{_BADGE_BASE} bg-gray-200 text-gray-800'
+
+# Client-side event handler that reaches the server only for the first
+# hover or tap of a card; the flag lives on the card's DOM node. Combining
+# it with a Python handler needs NiceGUI 2.18 (see requirements.txt)
+_EMIT_ONCE = """(e) => {
+    const el = e && e.currentTarget;
+    if (el && el.dataset.inflated) return;
+    if (el) el.dataset.inflated = '1';
+    emit();
+}"""
+
+# Static class strings of the page and device cards
+_PAGE_CLASSES = 'w-full items-center p-8'
+_HEADER_CLASSES = 'text-4xl font-bold mb-8'
+_SEARCH_CARD_CLASSES = 'w-full max-w-4xl mb-4'
+_SEARCH_ROW_CLASSES = 'w-full items-center gap-4'
+_STATUS_CLASSES = 'text-gray-600 mb-4'
+_DEVICES_CLASSES = 'w-full max-w-4xl gap-4'
+_CARD_CLASSES = 'w-full hover:shadow-lg transition-shadow cursor-pointer'
+_CARD_ROW_CLASSES = 'w-full items-center'
+_CARD_NAME_CLASSES = 'text-xl font-semibold'
+_CARD_FIELDS_CLASSES = 'w-full justify-start gap-10'
+_CARD_MUTED_CLASSES = 'text-sm text-gray-500'
+
+# Devices streamed in during a search are added in batches of at most
+# _DEVICE_BATCH_SIZE cards every _DEVICE_BATCH_INTERVAL seconds
+_DEVICE_BATCH_SIZE = 10
+_DEVICE_BATCH_INTERVAL = 0.1
+
 
 class MainView:
     """Main screen showing device discovery and list."""
 
-    def __init__(self, on_device_selected: Callable):
+    def __init__(self, on_device_selected: Callable[[Device], Awaitable]):
         """
         Initialize main view.
 
         Args:
-            on_device_selected: Callback(Device) when user selects a device
+            on_device_selected: Async callback(Device) when user selects a
+                                device; awaited by the Connect button handler
         """
         self.on_device_selected = on_device_selected
-        self.device_cards = {}  # {epr: ui.card}
+        # Rendered cards keyed by EPR, updated in place across searches:
+        # {epr: {'card', 'name_label', 'status_label',
+        #        'details', 'actions', 'ip_label'}}
+        # ip_label stays None until the card's deferred parts are built
+        self.device_cards = {}
+        # Device currently shown on each card, read by the Connect buttons
+        self._devices_by_epr: dict[str, Device] = {}
+        # Devices reported by a running search, not yet given a card
+        self._pending_devices: dict[str, Device] = {}
         self.search_callback = None  # Will be set by controller
+        # Set while a search runs so repeated clicks do not start another
+        self._search_in_flight = False
 
     def render(self):
         """Render the main view."""
-        with ui.column().classes('w-full items-center p-8'):
+        with ui.column().classes(_PAGE_CLASSES):
             # Header
-            ui.label('SDC Medical Device Monitor').classes(
-                'text-4xl font-bold mb-8')
+            ui.label('SDC Medical Device Monitor').classes(_HEADER_CLASSES)
 
             # Search section
-            with ui.card().classes('w-full max-w-4xl mb-4'):
-                with ui.row().classes('w-full items-center gap-4'):
+            with ui.card().classes(_SEARCH_CARD_CLASSES):
+                with ui.row().classes(_SEARCH_ROW_CLASSES):
                     ui.label('Discover Devices:').classes('text-lg')
                     self.search_button = ui.button(
                         'Search Network',
@@ -42,17 +98,28 @@ class MainView:
 
             # Status message
             self.status_label = ui.label(
-                'Click "Search Network" to find devices').classes('text-gray-600 mb-4')
+                'Click "Search Network" to find devices').classes(_STATUS_CLASSES)
 
             # Device list container
-            self.devices_container = ui.column().classes('w-full max-w-4xl gap-4')
+            self.devices_container = ui.column().classes(_DEVICES_CLASSES)
+
+            # Add devices streamed in by a running search in small batches
+            ui.timer(_DEVICE_BATCH_INTERVAL, self._add_pending_devices)
 
         return self
 
     async def _handle_search_click(self):
         """Internal handler for search button click."""
+        if self._search_in_flight:
+            return
         if self.search_callback:
-            await self.search_callback()
+            # Checked and set before the first await, so no other click
+            # handler can run in between on the event loop
+            self._search_in_flight = True
+            try:
+                await self.search_callback()
+            finally:
+                self._search_in_flight = False
         else:
             logger.warning("Search callback not set!")
             ui.notify("Search function not initialized", type='warning')
@@ -76,18 +143,53 @@ class MainView:
 
     def hide_searching(self):
         """Hide searching state."""
+        self._search_in_flight = False
         self.search_button.enable()
         self.search_spinner.visible = False
 
+    def add_device(self, device: Device):
+        """
+        Queue a device found by a running search for display.
+
+        Args:
+            device: Device that answered the search
+        """
+        if device.epr not in self.device_cards:
+            self._pending_devices[device.epr] = device
+
+    def _add_pending_devices(self):
+        """Create cards for the next batch of streamed-in devices."""
+        pending = self._pending_devices
+        if not pending:
+            return
+
+        with self.devices_container:
+            for epr in list(pending)[:_DEVICE_BATCH_SIZE]:
+                device = pending.pop(epr)
+                if epr not in self.device_cards:
+                    self._create_device_card(device)
+
+        self.status_label.text = f'Found {len(self.device_cards)} device(s)...'
+
     def display_devices(self, devices: list[Device]):
         """
         Display discovered devices.
 
+        Cards are reconciled by EPR: cards of devices that are gone are
+        deleted, new devices get a card, and the cards of devices found
+        again (or already added by add_device) are updated in place.
+
         Args:
             devices: List of Device objects to display
         """
-        self.devices_container.clear()
-        self.device_cards.clear()
+        cards = self.device_cards
+        by_epr = {device.epr: device for device in devices}
+        # The final list supersedes anything streamed in during the search
+        self._pending_devices.clear()
+
+        for epr in cards.keys() - by_epr.keys():
+            cards.pop(epr)['card'].delete()
+            del self._devices_by_epr[epr]
 
         if not devices:
             self.status_label.text = 'No devices found. Please ensure devices are online and try again.'
@@ -100,52 +202,115 @@ class MainView:
             'text-green-600', remove='text-blue-600 text-gray-600 text-red-600')
 
         with self.devices_container:
-            for device in devices:
-                self._create_device_card(device)
+            for epr, device in by_epr.items():
+                refs = cards.get(epr)
+                if refs is None:
+                    self._create_device_card(device)
+                else:
+                    self._update_device_card(refs, device)
+
+        # Cards streamed in during the search are in discovery order; move
+        # them into the order of the final list
+        if list(cards) != list(by_epr):
+            for index, epr in enumerate(by_epr):
+                cards[epr]['card'].move(target_index=index)
+            self.device_cards = {epr: cards[epr] for epr in by_epr}
 
     def _create_device_card(self, device: Device):
-        """Create a card for a single device."""
-        with ui.card().classes('w-full hover:shadow-lg transition-shadow cursor-pointer') as card:
-            self.device_cards[device.epr] = card
+        """
+        Create a card for a single device.
 
-            with ui.row().classes('w-full items-center'):
+        Only the summary is built up front; the IP address and the Connect
+        button are built on first hover (or tap) by _inflate_device_card.
+        """
+        with ui.card().classes(_CARD_CLASSES) as card:
+            with ui.row().classes(_CARD_ROW_CLASSES):
                 # Device icon
                 ui.icon('monitor_heart', size='lg').classes('text-blue-600')
 
                 # Device info
                 with ui.column().classes('flex-grow'):
-                    ui.label(device.get_display_name()).classes(
-                        'text-xl font-semibold')
+                    name_label = ui.label(device.get_display_name()).classes(
+                        _CARD_NAME_CLASSES)
 
-                    with ui.row().classes('w-full justify-start gap-10'):
+                    with ui.row().classes(_CARD_FIELDS_CLASSES):
                         ui.label(f'Facility: {device.location.facility}')
                         ui.label(f'Room: {device.location.poc}')
                         ui.label(f'Bed: {device.location.bed}')
 
                     ui.label(f'EPR: {device.epr}').classes(
-                        'text-sm text-gray-500')
+                        _CARD_MUTED_CLASSES)
+                    details = ui.row().classes(_CARD_FIELDS_CLASSES)
                 # Status badge
-                self._create_status_badge(device.status)
+                status_label = self._create_status_badge(device.status)
+
+                # Connect button slot
+                actions = ui.row()
+
+        self._devices_by_epr[device.epr] = device
+        self.device_cards[device.epr] = {
+            'card': card,
+            'name_label': name_label,
+            'status_label': status_label,
+            'details': details,
+            'actions': actions,
+            'ip_label': None,
+        }
+
+        inflate = partial(self._inflate_device_card, device.epr)
+        card.on('mouseenter', inflate, js_handler=_EMIT_ONCE)
+        card.on('click', inflate, js_handler=_EMIT_ONCE)
 
-                # Connect button
-                ui.button(
-                    'Connect',
-                    on_click=lambda d=device: self.on_device_selected(d),
-                    icon='link'
-                ).props('color=primary')
+    def _update_device_card(self, refs: dict, device: Device):
+        """Point an existing card at a rediscovered device."""
+        self._devices_by_epr[device.epr] = device
+
+        name = device.get_display_name()
+        if refs['name_label'].text != name:
+            refs['name_label'].text = name
+
+        text, classes = _STATUS_BADGES.get(
+            device.status, (device.status.label, _DEFAULT_BADGE_CLASSES))
+        status_label = refs['status_label']
+        if status_label.text != text:
+            status_label.text = text
+            status_label.classes(replace=classes)
+
+        ip_label = refs['ip_label']
+        if ip_label is not None:
+            ip_text = f'IP: {device.ip_address or "unknown"}'
+            if ip_label.text != ip_text:
+                ip_label.text = ip_text
+
+    def _inflate_device_card(self, epr: str):
+        """Build the deferred parts of a device card once."""
+        refs = self.device_cards.get(epr)
+        if refs is None or refs['ip_label'] is not None:
+            return
+
+        device = self._devices_by_epr[epr]
+        with refs['details']:
+            refs['ip_label'] = ui.label(
+                f'IP: {device.ip_address or "unknown"}').classes(
+                _CARD_MUTED_CLASSES)
+        with refs['actions']:
+            ui.button(
+                'Connect',
+                on_click=partial(self._on_connect_click, epr),
+                icon='link'
+            ).props('color=primary')
+
+    async def _on_connect_click(self, epr: str):
+        """Pass the device currently shown on a card to the selection callback."""
+        device = self._devices_by_epr.get(epr)
+        if device is not None:
+            await self.on_device_selected(device)
 
     def _create_status_badge(self, status: DeviceStatus):
         """Create status badge for device."""
-        colors = {
-            DeviceStatus.DISCOVERED: 'bg-gray-200 text-gray-800',
-            DeviceStatus.CONNECTING: 'bg-yellow-200 text-yellow-800',
-            DeviceStatus.CONNECTED: 'bg-green-200 text-green-800',
-            DeviceStatus.DISCONNECTED: 'bg-gray-300 text-gray-700',
-            DeviceStatus.ERROR: 'bg-red-200 text-red-800'
-        }
-        color = colors.get(status, 'bg-gray-200 text-gray-800')
-        ui.label(status.value.title()).classes(
-            f'px-3 py-1 rounded-full text-sm {color}')
+        text, classes = _STATUS_BADGES.get(
+            status, (status.label, _DEFAULT_BADGE_CLASSES))
+        return ui.label(text).classes(classes)
 
     def show_error(self, message: str):
         """Display error message."""
@@ -0,0 +1,189 @@
+"""Simulated SDC provider shared by the provider scripts."""
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.location import SdcLocation
+from sdc11073.loghelper import basic_logging_setup
+from sdc11073.mdib import ProviderMdib
+from sdc11073.provider import SdcProvider
+from sdc11073.wsdiscovery import WSDiscoverySingleAdapter
+from sdc11073.xml_types import pm_types
+from sdc11073.xml_types.dpws_types import ThisDeviceType
+from sdc11073.xml_types.dpws_types import ThisModelType
+
+# The provider we use, should match the one in consumer example
+# The UUID is created from a base
+base_uuid = uuid.UUID('{cc013678-79f6-403c-998f-3cc0cc050230}')
+
+TICK_SECONDS = 5.0  # Interval between simulated value updates
+# Ticks whose changes are collected into one metric transaction; 1 reports
+# every tick, larger values trade report latency for fewer reports
+COMMIT_TICKS_ENV = 'SDC_PROVIDER_COMMIT_TICKS'
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """How one metric of the MDIB is simulated."""
+    handle: str  # Descriptor handle in mdib.xml
+    start: float  # Value written at start-up
+    base: float  # Value the simulated noise is added to
+    noise_range: tuple[float, float]  # Uniform noise bounds (low, high)
+    clamp: Optional[tuple[float, float]] = None  # Value bounds (low, high)
+    slow_factor: int = 1  # Update every slow_factor-th tick only
+
+
+@lru_cache(maxsize=1024)
+def _dec(tenths: int) -> Decimal:
+    """Decimal for a value given in tenths, e.g. 715 -> Decimal('71.5')."""
+    return Decimal(tenths).scaleb(-1)
+
+
+def _write_value(transaction_mgr, handle: str, value: float):
+    """Write a one-decimal value to a metric state inside a transaction."""
+    transaction_mgr.get_state(handle).MetricValue.Value = _dec(round(value * 10))
+
+
+def _start_discovery(adapter: str) -> WSDiscoverySingleAdapter:
+    """Create and start WS-Discovery on the named adapter."""
+    discovery = WSDiscoverySingleAdapter(adapter)
+    discovery.start()
+    return discovery
+
+
+def _commit_ticks_from_env() -> int:
+    """Read the commit interval in ticks from the environment."""
+    try:
+        return max(1, int(os.environ.get(COMMIT_TICKS_ENV, 1)))
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "Ignoring invalid %s=%r", COMMIT_TICKS_ENV, os.environ[COMMIT_TICKS_ENV])
+        return 1
+
+
+def run_provider(adapter: str, specs: list[MetricSpec],
+                 mdib_path: str = "mdib.xml", device_id: str = "00001",
+                 commit_ticks: Optional[int] = None):
+    """
+    Start a provider and simulate its metrics until interrupted.
+
+    Args:
+        adapter: Network adapter WS-Discovery runs on, e.g. "en0"
+        specs: Simulated metrics
+        mdib_path: MDIB file of the device
+        device_id: Name the device EPR is derived from
+        commit_ticks: Ticks collected per metric transaction (defaults to
+                      the SDC_PROVIDER_COMMIT_TICKS environment variable, or 1)
+    """
+    basic_logging_setup(level=logging.INFO)
+
+    if commit_ticks is None:
+        commit_ticks = _commit_ticks_from_env()
+
+    my_uuid = uuid.uuid5(base_uuid, device_id)
+
+    # Discovery bring-up and the MDIB parse are independent, so they
+    # run side by side instead of one after the other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        discovery_future = executor.submit(_start_discovery, adapter)
+        # The BICEPS version is known, so the parse skips detecting it
+        mdib_future = executor.submit(
+            ProviderMdib.from_mdib_file, mdib_path, SdcV1Definitions)
+        my_discovery = discovery_future.result()
+        my_mdib = mdib_future.result()
+    print(f"My UUID is {my_uuid}")
+
+    # Set a location context to allow easy discovery
+    my_location = SdcLocation(fac='HOSP', poc='ICU', bed='Bed01')
+
+    # Set model information for discovery
+    dpws_model = ThisModelType(manufacturer='MyCompany',
+                               manufacturer_url='www.mycompany.com',
+                               model_name='SimplePatientMonitor',
+                               model_number='1.0',
+                               model_url='www.mycompany.com/model',
+                               presentation_url='www.mycompany.com/model/presentation')
+    dpws_device = ThisDeviceType(friendly_name='Patient Monitor',
+                                 firmware_version='Version_1.0',
+                                 serial_number='123456789')
+
+    # Create a device (provider) class
+    sdc_provider = SdcProvider(ws_discovery=my_discovery,
+                               epr=my_uuid,
+                               this_model=dpws_model,
+                               this_device=dpws_device,
+                               device_mdib_container=my_mdib)
+    sdc_provider.start_all()
+
+    # Set the location on our device
+    sdc_provider.set_location(my_location)
+
+    # Handles bound once, read inside every metric transaction; get_one
+    # fails early if a handle is missing from the MDIB file
+    handles = [my_mdib.descriptions.handle.get_one(spec.handle).Handle
+               for spec in specs]
+
+    # Initialize the metric states with their starting values
+    with my_mdib.metric_state_transaction() as transaction_mgr:
+        for handle, spec in zip(handles, specs):
+            state = transaction_mgr.get_state(handle)
+            state.mk_metric_value()
+            state.MetricValue.Value = _dec(round(spec.start * 10))
+            state.ActivationState = pm_types.ComponentActivation.ON
+
+    # Last values written to the MDIB; unchanged values are not re-sent
+    last_values = [spec.start for spec in specs]
+    # Newest changed value per handle, waiting for the next commit
+    pending: dict[str, float] = {}
+
+    # Main loop to simulate changing vital signs
+    # Ticks run on a fixed monotonic grid, so work time does not add drift
+    loop_counter = 0
+    deadline = time.monotonic()
+    while True:
+        loop_counter += 1
+        deadline += TICK_SECONDS
+        try:
+            # Simulate new values on the one-decimal grid they are reported
+            # with; only metrics whose value changed go into the transaction
+            for i, spec in enumerate(specs):
+                if loop_counter % spec.slow_factor:
+                    continue
+                value = spec.base + random.uniform(*spec.noise_range)
+                if spec.clamp is not None:
+                    low, high = spec.clamp
+                    value = max(low, min(high, value))
+                value = round(value, 1)
+                if value != last_values[i]:
+                    pending[handles[i]] = value
+                    last_values[i] = value
+
+            # Changes of commit_ticks ticks go out in one transaction
+            if pending and loop_counter % commit_ticks == 0:
+                with my_mdib.metric_state_transaction() as transaction_mgr:
+                    # State copies belong to their transaction, so each
+                    # write fetches the state again by its handle
+                    for handle, value in pending.items():
+                        _write_value(transaction_mgr, handle, value)
+
+                print(f"Updated {len(pending)} metric value(s)...")
+                pending.clear()
+
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        except KeyboardInterrupt:
+            print("Stopping provider...")
+            sdc_provider.stop_all()
+            break